@@ -0,0 +1,26 @@
+"""add banner variant urls to events
+
+Revision ID: add_banner_variants
+Revises: add_event_search_indexes
+Create Date: 2025-09-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_banner_variants'
+down_revision: Union[str, Sequence[str], None] = 'add_event_search_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.add_column('events', sa.Column('banner_thumb_url', sa.String(), nullable=True))
+    op.add_column('events', sa.Column('banner_card_url', sa.String(), nullable=True))
+    op.add_column('events', sa.Column('banner_full_url', sa.String(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('events', 'banner_full_url')
+    op.drop_column('events', 'banner_card_url')
+    op.drop_column('events', 'banner_thumb_url')
@@ -0,0 +1,33 @@
+"""add geocoded coordinates to events
+
+Revision ID: add_event_coordinates
+Revises: add_event_search_vector
+Create Date: 2025-10-12 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_event_coordinates'
+down_revision: Union[str, Sequence[str], None] = 'add_event_search_vector'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Existing events are geocoded afterwards by `python geo.py`
+    op.add_column('events', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('events', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('events', sa.Column('geohash', sa.String(length=12), nullable=True))
+    op.create_index('ix_events_geohash', 'events', ['geohash'], unique=False)
+    op.execute("CREATE EXTENSION IF NOT EXISTS cube")
+    op.execute("CREATE EXTENSION IF NOT EXISTS earthdistance")
+    op.execute("CREATE INDEX ix_events_earth ON events USING gist (ll_to_earth(latitude, longitude))")
+
+def downgrade() -> None:
+    op.execute("DROP INDEX ix_events_earth")
+    op.drop_index('ix_events_geohash', table_name='events')
+    op.drop_column('events', 'geohash')
+    op.drop_column('events', 'longitude')
+    op.drop_column('events', 'latitude')
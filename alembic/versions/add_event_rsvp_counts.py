@@ -0,0 +1,34 @@
+"""add denormalized rsvp counts to events
+
+Revision ID: add_event_rsvp_counts
+Revises: rewrite_local_banner_paths
+Create Date: 2025-10-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_event_rsvp_counts'
+down_revision: Union[str, Sequence[str], None] = 'rewrite_local_banner_paths'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ('yes', 'no', 'maybe')
+
+def upgrade() -> None:
+    for status in STATUSES:
+        op.add_column('events', sa.Column(f'rsvp_{status}_count', sa.Integer(), nullable=False, server_default='0'))
+    # Backfill from the existing RSVPs
+    op.execute(
+        "UPDATE events SET "
+        + ", ".join(
+            f"rsvp_{status}_count = (SELECT COUNT(*) FROM rsvps WHERE rsvps.event_id = events.id AND rsvps.status = '{status}')"
+            for status in STATUSES
+        )
+    )
+
+def downgrade() -> None:
+    for status in reversed(STATUSES):
+        op.drop_column('events', f'rsvp_{status}_count')
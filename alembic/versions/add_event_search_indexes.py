@@ -0,0 +1,48 @@
+"""add event search and lookup indexes
+
+Revision ID: add_event_search_indexes
+Revises: f06462ccbc55
+Create Date: 2025-09-14 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_event_search_indexes'
+down_revision: Union[str, Sequence[str], None] = 'f06462ccbc55'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_events_location_trgm', 'events', ['location'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'})
+    op.create_index('ix_events_category_trgm', 'events', ['category'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'category': 'gin_trgm_ops'})
+    op.create_index('ix_events_date_time_id', 'events', ['date', 'time', 'id'], unique=False)
+    op.create_index('ix_events_organizer_id_date', 'events', ['organizer_id', 'date'], unique=False)
+    op.create_index('ix_rsvps_event_id_status', 'rsvps', ['event_id', 'status'], unique=False)
+
+    # Drop duplicate rows so the unique indexes can be built: keep each user's
+    # latest RSVP and earliest membership
+    op.execute("""
+        DELETE FROM rsvps a USING rsvps b
+        WHERE a.user_id = b.user_id AND a.event_id = b.event_id AND a.id < b.id
+    """)
+    op.create_index('uq_rsvps_user_id_event_id', 'rsvps', ['user_id', 'event_id'], unique=True)
+    op.execute("""
+        DELETE FROM group_members a USING group_members b
+        WHERE a.group_id = b.group_id AND a.user_id = b.user_id AND a.id > b.id
+    """)
+    op.create_index('uq_group_members_group_id_user_id', 'group_members', ['group_id', 'user_id'], unique=True)
+
+def downgrade() -> None:
+    op.drop_index('uq_group_members_group_id_user_id', table_name='group_members')
+    op.drop_index('uq_rsvps_user_id_event_id', table_name='rsvps')
+    op.drop_index('ix_rsvps_event_id_status', table_name='rsvps')
+    op.drop_index('ix_events_organizer_id_date', table_name='events')
+    op.drop_index('ix_events_date_time_id', table_name='events')
+    op.drop_index('ix_events_category_trgm', table_name='events')
+    op.drop_index('ix_events_location_trgm', table_name='events')
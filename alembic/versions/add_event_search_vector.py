@@ -0,0 +1,31 @@
+"""add full-text search vector to events
+
+Revision ID: add_event_search_vector
+Revises: convert_event_time_to_time
+Create Date: 2025-10-11 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_event_search_vector'
+down_revision: Union[str, Sequence[str], None] = 'convert_event_time_to_time'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # A stored generated column is computed for existing rows while the table is rewritten
+    op.execute("""
+        ALTER TABLE events ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(location, '') || ' ' || coalesce(category, '')), 'C')
+        ) STORED
+    """)
+    op.create_index('ix_events_search_vector', 'events', ['search_vector'], unique=False, postgresql_using='gin')
+
+def downgrade() -> None:
+    op.drop_index('ix_events_search_vector', table_name='events')
+    op.drop_column('events', 'search_vector')
@@ -0,0 +1,61 @@
+"""maintain event rsvp counts with a trigger on rsvps
+
+Revision ID: add_rsvp_count_triggers
+Revises: add_event_rsvp_counts
+Create Date: 2025-10-04 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_rsvp_count_triggers'
+down_revision: Union[str, Sequence[str], None] = 'add_event_rsvp_counts'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ('yes', 'no', 'maybe')
+
+def upgrade() -> None:
+    # RSVP upserts and multi-row inserts bypass the ORM, so the counters are kept by the database
+    op.execute("""
+        CREATE OR REPLACE FUNCTION rsvps_maintain_event_counts() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' AND OLD.status = NEW.status AND OLD.event_id = NEW.event_id THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE events SET
+                    rsvp_yes_count = rsvp_yes_count - (OLD.status = 'yes')::int,
+                    rsvp_no_count = rsvp_no_count - (OLD.status = 'no')::int,
+                    rsvp_maybe_count = rsvp_maybe_count - (OLD.status = 'maybe')::int
+                WHERE id = OLD.event_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE events SET
+                    rsvp_yes_count = rsvp_yes_count + (NEW.status = 'yes')::int,
+                    rsvp_no_count = rsvp_no_count + (NEW.status = 'no')::int,
+                    rsvp_maybe_count = rsvp_maybe_count + (NEW.status = 'maybe')::int
+                WHERE id = NEW.event_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER rsvps_event_counts AFTER INSERT OR DELETE OR UPDATE OF status, event_id ON rsvps
+            FOR EACH ROW EXECUTE FUNCTION rsvps_maintain_event_counts()
+    """)
+    # Recount so the trigger starts from exact values
+    op.execute(
+        "UPDATE events SET "
+        + ", ".join(
+            f"rsvp_{status}_count = (SELECT COUNT(*) FROM rsvps WHERE rsvps.event_id = events.id AND rsvps.status = '{status}')"
+            for status in STATUSES
+        )
+    )
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS rsvps_event_counts ON rsvps")
+    op.execute("DROP FUNCTION IF EXISTS rsvps_maintain_event_counts()")
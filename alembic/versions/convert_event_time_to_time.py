@@ -0,0 +1,28 @@
+"""convert events.time from varchar to time
+
+Revision ID: convert_event_time_to_time
+Revises: add_rsvp_count_triggers
+Create Date: 2025-10-08 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'convert_event_time_to_time'
+down_revision: Union[str, Sequence[str], None] = 'add_rsvp_count_triggers'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Stored values are "HH:MM:SS" strings, which cast directly; the rewrite also rebuilds
+    # ix_events_date_time_id on the new type
+    op.alter_column('events', 'time', type_=sa.Time(), existing_nullable=False,
+                    postgresql_using='time::time')
+    op.create_index('ix_events_time', 'events', ['time'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index('ix_events_time', table_name='events')
+    op.alter_column('events', 'time', type_=sa.String(), existing_nullable=False,
+                    postgresql_using="to_char(time, 'HH24:MI:SS')")
@@ -0,0 +1,41 @@
+"""rewrite local banner paths to media urls
+
+Revision ID: rewrite_local_banner_paths
+Revises: add_banner_variants
+Create Date: 2025-09-27 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'rewrite_local_banner_paths'
+down_revision: Union[str, Sequence[str], None] = 'add_banner_variants'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BANNER_COLUMNS = ('banner_url', 'banner_thumb_url', 'banner_card_url', 'banner_full_url')
+UPLOADS_DIR = '/uploads/'
+MEDIA_URL = '/media/'
+
+def _rewrite(old: str, new: str) -> None:
+    # Local banners used to be stored as absolute paths like /srv/app/uploads/event_1_1700000000.jpg
+    conn = op.get_bind()
+    events = sa.table('events', sa.column('id', sa.Integer), *(sa.column(c, sa.String) for c in BANNER_COLUMNS))
+    rows = conn.execute(sa.select(events).where(sa.or_(*(events.c[c].like(f'%{old}%') for c in BANNER_COLUMNS)))).mappings()
+    for row in rows.all():
+        values = {}
+        for column in BANNER_COLUMNS:
+            url = row[column]
+            if url and old in url and not url.startswith(('http://', 'https://')):
+                values[column] = new + url.rsplit(old, 1)[1]
+        if values:
+            conn.execute(events.update().where(events.c.id == row['id']).values(**values))
+
+def upgrade() -> None:
+    _rewrite(UPLOADS_DIR, MEDIA_URL)
+
+def downgrade() -> None:
+    # The original absolute directory isn't recoverable; relative uploads/ paths resolve from the app's working directory
+    _rewrite(MEDIA_URL, 'uploads/')
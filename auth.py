@@ -1,12 +1,19 @@
+import asyncio
 import bcrypt
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
 from dotenv import load_dotenv
 import models, schemas, database
+from cache import TTLCache
 
 load_dotenv()
 
@@ -14,14 +21,60 @@ SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
+# bcrypt cost factor; existing hashes are upgraded on the next successful login when it changes
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Processes reserved for bcrypt; 0 hashes on the request threadpool instead
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+
+# Authenticated users by token subject; AUTH_CACHE_TTL=0 turns the cache off
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+
+_password_pool = None
+user_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
 
 def get_password_hash(password: str) -> str:
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when a hash was made with a different cost factor than BCRYPT_ROUNDS."""
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+def _get_password_pool():
+    global _password_pool
+    if _password_pool is None:
+        # spawn rather than fork: the server process already runs threads
+        _password_pool = ProcessPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _password_pool
+
+async def _run_password_task(fn, *args):
+    if PASSWORD_HASH_WORKERS <= 0:
+        return await run_in_threadpool(fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(_get_password_pool(), fn, *args)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash on the bcrypt process pool, keeping the CPU work off the API threads."""
+    return await _run_password_task(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
+def shutdown_password_pool():
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown(cancel_futures=True)
+        _password_pool = None
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -42,7 +95,28 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+    cached = user_cache.get(email)
+    if cached is not None:
+        # Attach the cached row to this request's session without a SELECT
+        return db.merge(cached, load=False)
     user = db.query(models.User).filter(models.User.email == email).first()
     if user is None:
         raise credentials_exception
+    user_cache.set(email, _detached_copy(user))
     return user
+
+def _detached_copy(user: models.User) -> models.User:
+    copy = models.User(**{attr.key: getattr(user, attr.key) for attr in inspect(models.User).column_attrs})
+    make_transient_to_detached(copy)
+    return copy
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    user_cache.delete(target.email)
+    for old_email in inspect(target).attrs.email.history.deleted:
+        user_cache.delete(old_email)
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(database.get_async_db)):
+    """Async-mode counterpart of get_current_user, resolved on the request's AsyncSession."""
+    return await db.run_sync(lambda session: get_current_user(token, session))
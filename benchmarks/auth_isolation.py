@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Load test: latency of non-auth routes during a login burst, with bcrypt on the
+request threadpool (PASSWORD_HASH_WORKERS=0) versus the dedicated process pool.
+
+Each run keeps `--logins` concurrent login loops busy while probing `--path` and
+reports the probe's p50/p99 latency alongside login throughput.
+
+Usage:
+    python benchmarks/auth_isolation.py --logins 64 --duration 15 --path "/events/?limit=20"
+
+Requirements:
+    - DATABASE_URL pointing at a migrated database
+    - uvicorn and httpx installed
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+from db_modes import percentile, start_server, wait_until_ready
+
+EMAIL = "bench.login@example.com"
+PASSWORD = "bench-password"
+
+
+async def run_burst(base_url: str, path: str, logins: int, duration: float) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0) as client:
+        await wait_until_ready(client)
+        await client.post("/register", json={"name": "Bench", "email": EMAIL, "password": PASSWORD})
+
+        deadline = time.monotonic() + duration
+        login_count = 0
+        probe_latencies = []
+
+        async def login_loop():
+            nonlocal login_count
+            while time.monotonic() < deadline:
+                await client.post("/login", data={"username": EMAIL, "password": PASSWORD})
+                login_count += 1
+
+        async def probe_loop():
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                await client.get(path)
+                probe_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(probe_loop(), *(login_loop() for _ in range(logins)))
+
+    probe_latencies.sort()
+    return {
+        "logins_per_s": login_count / duration,
+        "probe_p50": statistics.median(probe_latencies) * 1000,
+        "probe_p99": percentile(probe_latencies, 0.99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default="/events/?limit=20")
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    workers = os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1))
+    print(f"{args.logins} concurrent logins for {args.duration:.0f}s, probing {args.path}")
+    print(f"{'bcrypt on':<14} {'logins/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    for label, hash_workers in (("threadpool", "0"), (f"{workers} processes", workers)):
+        server = start_server(args.port, PASSWORD_HASH_WORKERS=hash_workers)
+        try:
+            result = asyncio.run(run_burst(f"http://127.0.0.1:{args.port}", args.path, args.logins, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"{label:<14} {result['logins_per_s']:>10.1f} {result['probe_p50']:>10.1f} {result['probe_p99']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark the sync (threadpool) and async (AsyncEngine) database modes against each other.
+
+Starts the app once per mode under uvicorn, fires concurrent requests at a read
+endpoint and reports throughput and latency percentiles for each.
+
+Usage:
+    python benchmarks/db_modes.py --concurrency 200 --requests 5000 --path "/events/?limit=50"
+
+Requirements:
+    - DATABASE_URL pointing at a database with data (see insert_dummy_data.py)
+    - uvicorn, httpx and the async extras (asyncpg or aiosqlite, greenlet) installed
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    return sorted_values[max(math.ceil(q * len(sorted_values)) - 1, 0)]
+
+
+def start_server(port: int, **env_overrides: str) -> subprocess.Popen:
+    env = dict(os.environ, **env_overrides)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await client.get("/")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+async def run_load(base_url: str, path: str, concurrency: int, total: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        await wait_until_ready(client)
+        for _ in range(min(concurrency, 50)):
+            await client.get(path)  # warm up the pool
+
+        latencies, errors = [], 0
+        queue = asyncio.Queue()
+        for _ in range(total):
+            queue.put_nowait(None)
+
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default="/events/?limit=50")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests to {args.path} with concurrency {args.concurrency}")
+    print(f"{'mode':<6} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}")
+    for db_async in (False, True):
+        server = start_server(args.port, DB_ASYNC="true" if db_async else "false")
+        try:
+            result = asyncio.run(run_load(f"http://127.0.0.1:{args.port}", args.path, args.concurrency, args.requests))
+        finally:
+            server.terminate()
+            server.wait()
+        mode = "async" if db_async else "sync"
+        print(f"{mode:<6} {result['rps']:>10.1f} {result['p50']:>10.1f} {result['p99']:>10.1f} {result['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of per-event JSON serialization for event list responses.
+
+Compares FastAPI's response_model path (dump the returned models, validate the result
+against response_model, dump again, render with json or orjson) with ModelResponse,
+which dumps the already-built models once. Building the EventResponse objects is timed
+separately since every path pays for it.
+
+Usage:
+    python benchmarks/serialization.py --events 1000 --repeat 20
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date, datetime, time as time_of_day
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+import schemas
+from responses import ModelResponse
+
+
+def make_events(count: int) -> List[schemas.EventResponse]:
+    organizer = schemas.UserOut(id=1, name="Organizer", email="organizer@example.com", created_at=datetime(2030, 1, 1))
+    return [
+        schemas.EventResponse(
+            id=i,
+            title=f"Community meetup #{i}",
+            description="Talks, demos and drinks. " * 8,
+            date=date(2030, 1, 1),
+            time=time_of_day(18, 0),
+            location="Tech Hub, 123 Main St, San Francisco, CA",
+            category="Technology",
+            latitude=37.7749,
+            longitude=-122.4194,
+            organizer=organizer,
+            created_at=datetime(2030, 1, 1),
+            banner_url=f"/media/{i:064x}.jpg",
+            rsvp_count=25,
+            rsvp_counts={"yes": 25, "no": 3, "maybe": 7},
+        )
+        for i in range(count)
+    ]
+
+
+def response_model_path(response_class):
+    field = create_model_field("Response", List[schemas.EventResponse], mode="serialization")
+
+    def render(events):
+        content = asyncio.run(serialize_response(field=field, response_content=events, is_coroutine=False))
+        return response_class(content).body
+
+    return render
+
+
+def model_response_path(events):
+    return ModelResponse(events, List[schemas.EventResponse]).body
+
+
+def per_event_us(fn, count: int, repeat: int) -> float:
+    fn()  # warm up adapters and validators
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    paths = {
+        "build EventResponse": lambda: make_events(args.events),
+        "response_model + JSONResponse (before)": lambda: response_model_path(JSONResponse)(events),
+        "response_model + ORJSONResponse": lambda: response_model_path(ORJSONResponse)(events),
+        "ModelResponse (after)": lambda: model_response_path(events),
+    }
+    assert response_model_path(ORJSONResponse)(events) == model_response_path(events)
+
+    print(f"{args.events} events, best of {args.repeat}")
+    for name, fn in paths.items():
+        print(f"  {name:<40} {per_event_us(fn, args.events, args.repeat):8.2f} us/event")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+import models, schemas
+
+def check_user_ids(db: Session, user_ids: List[int]) -> Dict[int, str]:
+    """
+    Validate a batch's user ids in one query. Returns {item_index: error} for unknown
+    users and for repeats of an id earlier in the batch; the remaining items get written.
+    """
+    known = {user_id for (user_id,) in db.query(models.User.id).filter(models.User.id.in_(set(user_ids)))}
+    errors, seen = {}, set()
+    for index, user_id in enumerate(user_ids):
+        if user_id not in known:
+            errors[index] = "User not found"
+        elif user_id in seen:
+            errors[index] = "Duplicate item"
+        seen.add(user_id)
+    return errors
+
+def bulk_result(user_ids: List[int], errors: Dict[int, str], written: Dict[int, int], skipped_error: str) -> schemas.BulkResult:
+    """
+    Per-item results in request order. `written` maps user id to the row id the statement
+    returned; valid items it didn't return are reported with `skipped_error`.
+    """
+    results = []
+    for index, user_id in enumerate(user_ids):
+        if index in errors:
+            results.append(schemas.BulkItemResult(user_id=user_id, ok=False, error=errors[index]))
+        elif user_id in written:
+            results.append(schemas.BulkItemResult(user_id=user_id, ok=True, id=written[user_id]))
+        else:
+            results.append(schemas.BulkItemResult(user_id=user_id, ok=False, error=skipped_error))
+    return schemas.BulkResult(results=results)
@@ -0,0 +1,189 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+from dotenv import load_dotenv
+from fastapi import Request, Response
+
+from responses import model_adapter
+
+load_dotenv()
+
+# Public read responses; RESPONSE_CACHE_URL=redis://... shares them between workers
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL")
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+
+
+class TTLCache:
+    """Thread-safe LRU mapping whose entries expire `ttl` seconds after they are set."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Any], bool]):
+        """Drop every entry whose value satisfies `predicate`."""
+        with self._lock:
+            for key in [k for k, (_, value) in self._data.items() if predicate(value)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+            }
+
+
+class InMemoryBackend:
+    """Per-process response store: an LRU whose entries remember their invalidation tags."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def set(self, key: str, value: bytes, tags: Iterable[str]):
+        self._entries.set(key, (frozenset(tags), value))
+
+    def invalidate(self, tags: Iterable[str]):
+        tags = set(tags)
+        self._entries.delete_where(lambda entry: not tags.isdisjoint(entry[0]))
+
+    def stats(self) -> dict:
+        return self._entries.stats()
+
+
+class RedisBackend:
+    """
+    Response store on any client speaking the redis-py command API.
+    Each tag is a set of the keys cached under it, expiring along with them.
+    """
+
+    def __init__(self, client, ttl: float, prefix: str = "tv:resp:"):
+        self.client = client
+        self.ttl = int(ttl)
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes, tags: Iterable[str]):
+        pipe = self.client.pipeline()
+        pipe.set(self.prefix + key, value, ex=self.ttl)
+        for tag in tags:
+            pipe.sadd(self.prefix + "tag:" + tag, self.prefix + key)
+            pipe.expire(self.prefix + "tag:" + tag, self.ttl)
+        pipe.execute()
+
+    def invalidate(self, tags: Iterable[str]):
+        tag_keys = [self.prefix + "tag:" + tag for tag in tags]
+        keys = set()
+        for tag_key in tag_keys:
+            keys.update(self.client.smembers(tag_key))
+        self.client.delete(*keys, *tag_keys)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "ttl_seconds": self.ttl}
+
+
+class ResponseCache:
+    """
+    Caches serialized JSON bodies of public GET endpoints, keyed by path and query string.
+    Writers call invalidate() with the tags of whatever they changed.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    @staticmethod
+    def key_for(request: Request) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{request.method}:{request.url.path}?{query}"
+
+    def respond(self, request: Request, response_model, tags: Iterable[str], build: Callable[[], Any]) -> Response:
+        """Serve `request` from the cache, or run `build` and cache its serialized result."""
+        key = self.key_for(request)
+        cached = self.backend.get(key)
+        if cached is not None:
+            etag, body = cached.split(b"\n", 1)
+            etag = etag.decode("ascii")
+        else:
+            adapter = model_adapter(response_model)
+            body = adapter.dump_json(adapter.validate_python(build(), from_attributes=True))
+            etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            self.backend.set(key, etag.encode("ascii") + b"\n" + body, tags)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    def invalidate(self, *tags: str):
+        self.backend.invalidate(tags)
+
+    def stats(self) -> dict:
+        return self.backend.stats()
+
+
+def _default_backend():
+    if RESPONSE_CACHE_URL:
+        import redis
+
+        return RedisBackend(redis.Redis.from_url(RESPONSE_CACHE_URL), ttl=RESPONSE_CACHE_TTL)
+    return InMemoryBackend(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+
+
+response_cache = ResponseCache(_default_backend())
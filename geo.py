@@ -0,0 +1,223 @@
+"""
+Event coordinates: offline geocoding against the bundled gazetteer (data/gazetteer.csv,
+with country and state names in data/regions.csv), geohashes, and the SQL clause behind
+the events `near` filter.
+
+On PostgreSQL `near` uses cube/earthdistance, matching the GiST index on
+ll_to_earth(latitude, longitude) (see models.py). Elsewhere it narrows to the geohash
+cells around the point, a range scan on ix_events_geohash, then applies an
+equirectangular distance check, which is accurate to well under 1% at these radii.
+"""
+import csv
+import math
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import and_, func, or_
+
+import models, database
+
+load_dotenv()
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+GAZETTEER_PATH = os.getenv("GAZETTEER_PATH", os.path.join(DATA_DIR, "gazetteer.csv"))
+REGIONS_PATH = os.getenv("REGIONS_PATH", os.path.join(DATA_DIR, "regions.csv"))
+GEOHASH_PRECISION = 9  # ~5m cells
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+KM_PER_DEGREE = 111.195
+# A city name followed by one of these names a street or venue ("Washington Square"), not the city
+VENUE_WORDS = frozenset({
+    "street", "st", "avenue", "ave", "road", "rd", "boulevard", "blvd", "lane", "drive", "way", "place",
+    "square", "sq", "park", "plaza", "hall", "center", "centre", "station", "bridge", "heights", "county",
+})
+DEFAULT_RADIUS_KM = 10.0
+MAX_RADIUS_KM = 500.0
+
+class Place(NamedTuple):
+    name: str
+    admin: str
+    country: str
+    latitude: float
+    longitude: float
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return " ".join(re.findall(r"[a-z0-9']+", text.lower()))
+
+@lru_cache(maxsize=1)
+def _gazetteer() -> Tuple[Dict[str, List[Place]], "re.Pattern"]:
+    """Places by normalized name, in file order, plus a pattern finding any name as whole words."""
+    places: Dict[str, List[Place]] = {}
+    with open(GAZETTEER_PATH, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            place = Place(row["name"], row["admin"], row["country"], float(row["latitude"]), float(row["longitude"]))
+            places.setdefault(_normalize(place.name), []).append(place)
+    names = sorted(places, key=len, reverse=True)
+    return places, re.compile(r"\b(" + "|".join(re.escape(name) for name in names) + r")\b")
+
+@lru_cache(maxsize=1)
+def _regions() -> Dict[str, set]:
+    """{normalized country/state name or code: {(country, admin)}}; admin is "" for a whole country."""
+    regions: Dict[str, set] = {}
+    with open(REGIONS_PATH, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            regions.setdefault(_normalize(row["name"]), set()).add((row["country"], row["admin"]))
+    for matches in _gazetteer()[0].values():
+        for place in matches:
+            regions.setdefault(place.country.lower(), set()).add((place.country, ""))
+            if place.admin:
+                regions.setdefault(place.admin.lower(), set()).add((place.country, place.admin))
+    return regions
+
+def _qualifies(part: str, place: Place) -> Optional[bool]:
+    """
+    Whether a part after the city name fits `place`: True for its state or country (name or
+    code) and for postal codes, False for another known region, None when unrecognized.
+    """
+    words = [word for word in part.split() if not any(ch.isdigit() for ch in word)]
+    if not words:
+        return True
+    regions = _regions().get(" ".join(words))
+    if regions is None:
+        return None
+    return any(country == place.country and admin in ("", place.admin) for country, admin in regions)
+
+def _whole_word_match(parts: List[str]) -> Optional[Place]:
+    """
+    A city named inside a part ("Rooftop bar in Zurich"), only when nothing else could be
+    meant: every other part is an address line with digits, exactly one gazetteer name
+    with a single entry appears, and it isn't part of a street or venue name.
+    """
+    places, any_name = _gazetteer()
+    named = [part for part in parts if any_name.search(part)]
+    if len(named) != 1 or any(not re.search(r"\d", part) for part in parts if part is not named[0]):
+        return None
+    matches = list(any_name.finditer(named[0]))
+    names = {match.group(1) for match in matches}
+    if len(names) != 1 or len(places[matches[0].group(1)]) != 1:
+        return None
+    for match in matches:
+        following = named[0][match.end():].split()[:1]
+        if following and following[0] in VENUE_WORDS:
+            return None
+    return places[matches[0].group(1)][0]
+
+def geocode(location: Optional[str]) -> Optional[Tuple[float, float]]:
+    """
+    Coordinates for a free-text location like "Tech Hub, 123 Main St, San Francisco, CA".
+    The first comma-separated part that is a gazetteer name is the city, provided every part
+    after it is a state, country or postal code that fits ("Paris, TX" picks Texas; "London,
+    Ontario" matches no London in the gazetteer). Without such a part the city may appear
+    inside a part (see _whole_word_match). Returns None rather than guess.
+    """
+    if not location:
+        return None
+    places, _ = _gazetteer()
+    parts = [part for part in (_normalize(part) for part in location.split(",")) if part]
+    if any(part in places for part in parts):
+        for i, part in enumerate(parts):
+            for place in places.get(part, ()):
+                if all(_qualifies(qualifier, place) for qualifier in parts[i + 1:]):
+                    return place.latitude, place.longitude
+        return None
+    place = _whole_word_match(parts)
+    return (place.latitude, place.longitude) if place else None
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        value, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+def coordinates_for(location: Optional[str]) -> dict:
+    """latitude/longitude/geohash column values for an event at `location` (None when not geocoded)."""
+    point = geocode(location)
+    if point is None:
+        return {"latitude": None, "longitude": None, "geohash": None}
+    return {"latitude": point[0], "longitude": point[1], "geohash": geohash_encode(*point)}
+
+def parse_point(text: str) -> Optional[Tuple[float, float]]:
+    """(lat, lon) from "lat,lon", or None when malformed or out of range."""
+    try:
+        latitude, longitude = (float(part) for part in text.split(","))
+    except ValueError:
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return latitude, longitude
+
+def _cell_size(precision: int) -> Tuple[float, float]:
+    """(lat, lon) size in degrees of a geohash cell."""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+def covering_cells(latitude: float, longitude: float, radius_km: float) -> List[str]:
+    """
+    Geohash prefixes whose cells together cover the circle: the point's cell and its 8
+    neighbours, at the finest precision whose cells are at least radius_km across.
+    Empty when the radius is too large for any precision.
+    """
+    farthest_latitude = min(abs(latitude) + radius_km / KM_PER_DEGREE, 90.0)
+    km_per_degree_lon = KM_PER_DEGREE * math.cos(math.radians(farthest_latitude))
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_size, lon_size = _cell_size(precision)
+        if lat_size * KM_PER_DEGREE >= radius_km and lon_size * km_per_degree_lon >= radius_km:
+            break
+    else:
+        return []
+    cells = set()
+    for dlat in (-1, 0, 1):
+        for dlon in (-1, 0, 1):
+            lat = max(-90.0, min(90.0, latitude + dlat * lat_size))
+            lon = (longitude + dlon * lon_size + 180.0) % 360.0 - 180.0
+            cells.add(geohash_encode(lat, lon, precision))
+    return sorted(cells)
+
+def near_clause(db, latitude: float, longitude: float, radius_km: float):
+    """WHERE clause for events within radius_km of the point."""
+    if db.get_bind().dialect.name == "postgresql":
+        center = func.ll_to_earth(latitude, longitude)
+        point = func.ll_to_earth(models.Event.latitude, models.Event.longitude)
+        radius_m = radius_km * 1000
+        return and_(func.earth_box(center, radius_m).op("@>")(point), func.earth_distance(center, point) <= radius_m)
+    # "{" sorts right after "z", so [cell, cell + "{") is every hash with that prefix
+    cells = or_(*(and_(models.Event.geohash >= cell, models.Event.geohash < cell + "{") for cell in covering_cells(latitude, longitude, radius_km)))
+    dy = (models.Event.latitude - latitude) * KM_PER_DEGREE
+    dx = (models.Event.longitude - longitude) * (KM_PER_DEGREE * math.cos(math.radians(latitude)))
+    return and_(models.Event.geohash.isnot(None), cells, dy * dy + dx * dx <= radius_km * radius_km)
+
+def backfill_coordinates(db) -> int:
+    """Geocode events that have a location but no coordinates; returns how many were found."""
+    found = 0
+    for event in db.query(models.Event).filter(models.Event.latitude.is_(None)).yield_per(500):
+        values = coordinates_for(event.location)
+        if values["latitude"] is not None:
+            for column, value in values.items():
+                setattr(event, column, value)
+            found += 1
+    db.commit()
+    return found
+
+if __name__ == "__main__":
+    session = database.SessionLocal()
+    try:
+        print(f"Geocoded {backfill_coordinates(session)} events")
+    finally:
+        session.close()
@@ -0,0 +1,70 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+from dotenv import load_dotenv
+from fastapi.concurrency import run_in_threadpool
+
+load_dotenv()
+
+# Processes reserved for banner resizing; 0 renders on the threadpool instead
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+WEBP_QUALITY = int(os.getenv("WEBP_QUALITY", "80"))
+
+# name -> (bounding box, crop to fill the box exactly)
+BANNER_VARIANTS = {
+    "thumb": ((320, 180), True),
+    "card": ((800, 450), True),
+    "full": ((1920, 1080), False),
+}
+
+_image_pool = None
+
+def render_banner_variants(source_path: str, output_dir: str, stem: str) -> Dict[str, str]:
+    """
+    Write a WebP file per BANNER_VARIANTS entry for the image at `source_path`.
+    Runs in a worker process; returns {variant name: output path}.
+    """
+    # Imported here so only the workers pay for loading Pillow
+    from PIL import Image, ImageOps
+
+    paths = {}
+    with Image.open(source_path) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+        for name, (size, crop) in BANNER_VARIANTS.items():
+            if crop:
+                variant = ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+            else:
+                variant = image.copy()
+                variant.thumbnail(size, Image.Resampling.LANCZOS)  # never upscales
+            path = os.path.join(output_dir, f"{stem}_{name}.webp")
+            variant.save(path, "WEBP", quality=WEBP_QUALITY, method=4)
+            paths[name] = path
+    return paths
+
+def _get_image_pool():
+    global _image_pool
+    if _image_pool is None:
+        _image_pool = ProcessPoolExecutor(
+            max_workers=IMAGE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _image_pool
+
+async def render_banner_variants_async(source_path: str, output_dir: str, stem: str) -> Dict[str, str]:
+    if IMAGE_WORKERS <= 0:
+        return await run_in_threadpool(render_banner_variants, source_path, output_dir, stem)
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_image_pool(), render_banner_variants, source_path, output_dir, stem
+    )
+
+def shutdown_image_pool():
+    global _image_pool
+    if _image_pool is not None:
+        _image_pool.shutdown(cancel_futures=True)
+        _image_pool = None
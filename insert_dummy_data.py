@@ -307,7 +307,7 @@ def create_dummy_events(db: Session, users: list[User]) -> list[Event]:
             title=event_data["title"],
             description=event_data["description"],
             date=event_date,
-            time=event_time.strftime("%H:%M:%S"),
+            time=event_time,
             location=event_data["location"],
             organizer_id=organizer.id,
             banner_url=event_data["banner_url"]
@@ -1,9 +1,26 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from routers import users, events, groups
+from routers.async_routes import make_async_router
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+import auth, database, images, metrics, storage
+from cache import response_cache
+from storage import MediaFiles, UploadSizeLimitMiddleware
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if storage.STORAGE_WARM_UP:
+        # Off the event loop: building the S3 client reads its service model from disk
+        await run_in_threadpool(storage.warm_up)
+    yield
+    auth.shutdown_password_pool()
+    images.shutdown_image_pool()
 
 #url = http://127.0.0.1:8000/docs#/default/login_login_post
-app = FastAPI()
+# orjson renders plain content; event handlers return responses.ModelResponse
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Or specify your frontend's address for more security
@@ -11,10 +28,40 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(UploadSizeLimitMiddleware, path_pattern=r"^/events/\d+/upload$")
+# Added last so it is outermost and also sees 413s from the upload limit
+app.add_middleware(metrics.MetricsMiddleware)
+metrics.instrument_engine(database.engine)
+if database.async_engine is not None:
+    metrics.instrument_engine(database.async_engine.sync_engine)
+# /register and /login are bcrypt-bound, so users stays on the threadpool in both modes
 app.include_router(users.router)
-app.include_router(events.router)
-app.include_router(groups.router)
+if database.DB_ASYNC:
+    app.include_router(make_async_router(events.router))
+    app.include_router(make_async_router(groups.router))
+else:
+    app.include_router(events.router)
+    app.include_router(groups.router)
+
+if isinstance(storage.media_storage, storage.LocalStorage):
+    app.mount(storage.MEDIA_URL, MediaFiles(directory=storage.media_storage.root, check_dir=False), name="media")
 
 @app.get("/")
 def root():
     return {"message": "Tribe Vibe - Authentication"}
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/metrics/db-pool")
+def db_pool_metrics():
+    return database.pool_stats()
+
+@app.get("/metrics/auth-cache")
+def auth_cache_metrics():
+    return auth.user_cache.stats()
+
+@app.get("/metrics/response-cache")
+def response_cache_metrics():
+    return response_cache.stats()
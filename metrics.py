@@ -0,0 +1,228 @@
+"""
+Prometheus metrics for GET /metrics: per-route request latency, requests in flight,
+responses by status code, and per-request SQL query counts and time. Like the JSON stats
+under /metrics/*, the metrics are kept in-process and rendered in the Prometheus text
+format here rather than through a client library.
+
+SQL statements are timed with engine events (instrument_engine) and attributed to the
+request that ran them through a context variable set by MetricsMiddleware; contextvars
+follow the request into the threadpool and into AsyncSession.run_sync.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import event
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SQL_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(line for labels, value in items for line in self._samples(labels, value))
+        return lines
+
+    def _samples(self, labels: Tuple[str, ...], value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str):
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                # [per-bucket counts with a final +Inf bucket, sum, count]
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][bisect.bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def snapshot(self, *labels: str) -> Tuple[float, int]:
+        """(sum, count) observed for `labels`."""
+        with self._lock:
+            entry = self._values.get(labels)
+            return (entry[1], entry[2]) if entry else (0.0, 0)
+
+    def _samples(self, labels: Tuple[str, ...], entry) -> List[str]:
+        names = self.labelnames + ("le",)
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), entry[0]):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else _format_value(bound)
+            lines.append(f"{self.name}_bucket{_format_labels(names, labels + (le,))} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(entry[1])}")
+        lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {entry[2]}")
+        return lines
+
+
+http_requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being served.", ["method"])
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ["method", "route"], LATENCY_BUCKETS
+)
+http_responses_total = Counter("http_responses_total", "HTTP responses by route template and status code.", ["method", "route", "status"])
+http_request_sql_queries = Histogram(
+    "http_request_sql_queries", "SQL statements executed per HTTP request.", ["method", "route"], SQL_QUERY_BUCKETS
+)
+http_request_sql_seconds = Histogram(
+    "http_request_sql_seconds", "Time spent in SQL statements per HTTP request.", ["method", "route"], SQL_SECONDS_BUCKETS
+)
+sql_queries_total = Counter("sql_queries_total", "SQL statements executed, including those outside requests.")
+
+REGISTRY = [
+    http_requests_in_flight,
+    http_request_duration_seconds,
+    http_responses_total,
+    http_request_sql_queries,
+    http_request_sql_seconds,
+    sql_queries_total,
+]
+
+
+def render() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+class RequestSQL:
+    """SQL statements run on behalf of one request."""
+
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# Mutated in place, so statements run in a copied context (threadpool) still count
+_request_sql: contextvars.ContextVar = contextvars.ContextVar("request_sql", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["metrics_query_start"].pop()
+    sql_queries_total.inc()
+    stats = _request_sql.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("metrics_query_start"):
+        conn.info["metrics_query_start"].pop()
+
+
+def instrument_engine(engine):
+    """Count and time every statement `engine` executes (for an AsyncEngine, pass .sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def route_label(scope) -> str:
+    """The matched route's path template, so /events/1 and /events/2 share a series."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "endpoint" in scope:
+        # A mounted app such as /media: the router extends root_path with the mount path
+        return scope.get("root_path") or "/"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Records latency, status and SQL usage of every HTTP request, labelled by route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestSQL()
+        token = _request_sql.set(stats)
+        http_requests_in_flight.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec(method)
+            _request_sql.reset(token)
+            route = route_label(scope)
+            http_request_duration_seconds.observe(elapsed, method, route)
+            http_responses_total.inc(method, route, str(status))
+            http_request_sql_queries.observe(stats.queries, method, route)
+            http_request_sql_seconds.observe(stats.seconds, method, route)
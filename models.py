@@ -1,7 +1,7 @@
 from sqlalchemy import Table
 # Association table for group members
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, Float, String, DateTime, Time, ForeignKey, Enum, Index, DDL, event
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
@@ -30,6 +30,10 @@ class GroupMember(Base):
 
     group = relationship('Group', backref='memberships')
     user = relationship('User', backref='group_memberships')
+
+    __table_args__ = (
+        Index('uq_group_members_group_id_user_id', 'group_id', 'user_id', unique=True),
+    )
 class Group(Base):
     __tablename__ = "groups"
     id = Column(Integer, primary_key=True, index=True)
@@ -47,17 +51,43 @@ class Event(Base):
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
     date = Column(DateTime(timezone=False), nullable=False)
-    time = Column(String, nullable=False)  # Store as string (HH:MM:SS)
+    time = Column(Time, nullable=False)
     location = Column(String, nullable=False)
     category = Column(String, nullable=True)  # Event category (e.g., "Technology", "Sports", "Music", etc.)
+    # Geocoded from location against the bundled gazetteer (geo.py); NULL when not recognized
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)
     organizer_id = Column(Integer, ForeignKey('users.id'), nullable=False)
 
     banner_url = Column(String, nullable=True)
+    # WebP renditions of banner_url, filled in by the background image pipeline
+    banner_thumb_url = Column(String, nullable=True)
+    banner_card_url = Column(String, nullable=True)
+    banner_full_url = Column(String, nullable=True)
+    # Denormalized RSVP counts per status, maintained by the rsvps triggers below
+    rsvp_yes_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rsvp_no_count = Column(Integer, nullable=False, default=0, server_default='0')
+    rsvp_maybe_count = Column(Integer, nullable=False, default=0, server_default='0')
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    organizer = relationship('User', backref='events')
+    # Every event serializer embeds the organizer, so load it in the same SELECT
+    organizer = relationship('User', backref='events', lazy='joined')
     rsvps = relationship('RSVP', back_populates='event')
 
+    __table_args__ = (
+        # Trigram indexes serve the substring ilike filters in list_events
+        Index('ix_events_location_trgm', 'location', postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'}),
+        Index('ix_events_category_trgm', 'category', postgresql_using='gin', postgresql_ops={'category': 'gin_trgm_ops'}),
+        # Matches the (date, time, id) keyset ordering of list_events
+        Index('ix_events_date_time_id', 'date', 'time', 'id'),
+        Index('ix_events_organizer_id_date', 'organizer_id', 'date'),
+        # Serves the starts_after filter of list_events
+        Index('ix_events_time', 'time'),
+        # Serves the near filter of list_events outside PostgreSQL (geohash cell range scans)
+        Index('ix_events_geohash', 'geohash'),
+    )
+
 
 
 class RSVP(Base):
@@ -70,3 +100,83 @@ class RSVP(Base):
 
     user = relationship('User', back_populates='rsvps')
     event = relationship('Event', back_populates='rsvps')
+
+    __table_args__ = (
+        Index('ix_rsvps_event_id_status', 'event_id', 'status'),
+        Index('uq_rsvps_user_id_event_id', 'user_id', 'event_id', unique=True),
+    )
+
+# Keep events.rsvp_*_count in step with rsvps inside the writing statement itself, so ORM
+# writes, ON CONFLICT upserts and multi-row inserts are all counted. Mirrored by the
+# add_rsvp_count_triggers migration; rsvp_counts.reconcile_rsvp_counts repairs drift.
+RSVP_COUNTS_POSTGRESQL = """
+CREATE OR REPLACE FUNCTION rsvps_maintain_event_counts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.status = NEW.status AND OLD.event_id = NEW.event_id THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE events SET
+            rsvp_yes_count = rsvp_yes_count - (OLD.status = 'yes')::int,
+            rsvp_no_count = rsvp_no_count - (OLD.status = 'no')::int,
+            rsvp_maybe_count = rsvp_maybe_count - (OLD.status = 'maybe')::int
+        WHERE id = OLD.event_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE events SET
+            rsvp_yes_count = rsvp_yes_count + (NEW.status = 'yes')::int,
+            rsvp_no_count = rsvp_no_count + (NEW.status = 'no')::int,
+            rsvp_maybe_count = rsvp_maybe_count + (NEW.status = 'maybe')::int
+        WHERE id = NEW.event_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+CREATE TRIGGER rsvps_event_counts AFTER INSERT OR DELETE OR UPDATE OF status, event_id ON rsvps
+    FOR EACH ROW EXECUTE FUNCTION rsvps_maintain_event_counts();
+"""
+
+def _sqlite_rsvp_counts_update(row: str, sign: str) -> str:
+    return f"""UPDATE events SET
+        rsvp_yes_count = rsvp_yes_count {sign} ({row}.status = 'yes'),
+        rsvp_no_count = rsvp_no_count {sign} ({row}.status = 'no'),
+        rsvp_maybe_count = rsvp_maybe_count {sign} ({row}.status = 'maybe')
+    WHERE id = {row}.event_id;"""
+
+RSVP_COUNTS_SQLITE = [
+    f"CREATE TRIGGER rsvps_event_counts_insert AFTER INSERT ON rsvps BEGIN {_sqlite_rsvp_counts_update('NEW', '+')} END",
+    f"CREATE TRIGGER rsvps_event_counts_delete AFTER DELETE ON rsvps BEGIN {_sqlite_rsvp_counts_update('OLD', '-')} END",
+    "CREATE TRIGGER rsvps_event_counts_update AFTER UPDATE OF status, event_id ON rsvps "
+    "WHEN OLD.status != NEW.status OR OLD.event_id != NEW.event_id BEGIN "
+    f"{_sqlite_rsvp_counts_update('OLD', '-')} {_sqlite_rsvp_counts_update('NEW', '+')} END",
+]
+
+event.listen(RSVP.__table__, "after_create", DDL(RSVP_COUNTS_POSTGRESQL).execute_if(dialect="postgresql"))
+for statement in RSVP_COUNTS_SQLITE:
+    event.listen(RSVP.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+# Full-text search over events: a stored generated tsvector (title weighted highest) with a
+# GIN index, PostgreSQL only. Mirrored by the add_event_search_vector migration; search.py
+# falls back to ilike matching elsewhere.
+SEARCH_CONFIG = 'english'
+EVENTS_SEARCH_VECTOR_POSTGRESQL = f"""
+ALTER TABLE events ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B') ||
+    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(location, '') || ' ' || coalesce(category, '')), 'C')
+) STORED;
+CREATE INDEX ix_events_search_vector ON events USING gin (search_vector);
+"""
+
+event.listen(Event.__table__, "after_create", DDL(EVENTS_SEARCH_VECTOR_POSTGRESQL).execute_if(dialect="postgresql"))
+
+# Distance queries for the near filter: earthdistance over cube, with a GiST index on the
+# earth point, PostgreSQL only. Mirrored by the add_event_coordinates migration; geo.py
+# uses ix_events_geohash elsewhere.
+EVENTS_EARTH_INDEX_POSTGRESQL = """
+CREATE EXTENSION IF NOT EXISTS cube;
+CREATE EXTENSION IF NOT EXISTS earthdistance;
+CREATE INDEX ix_events_earth ON events USING gist (ll_to_earth(latitude, longitude));
+"""
+
+event.listen(Event.__table__, "after_create", DDL(EVENTS_EARTH_INDEX_POSTGRESQL).execute_if(dialect="postgresql"))
@@ -0,0 +1,33 @@
+"""
+JSON responses. Plain content (dicts, and whatever FastAPI has validated against a route's
+response_model) is rendered by orjson, the app's default response class (see main.py).
+Handlers that have already built their response model return ModelResponse instead:
+FastAPI passes Response objects through untouched, so the model is dumped once by its own
+pydantic serializer rather than dumped, validated against response_model and dumped again.
+Compare with `python benchmarks/serialization.py`.
+"""
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def model_adapter(response_model) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+class ModelResponse(Response):
+    """
+    Serializes pydantic content as `response_model` (default: the content's own type).
+    Pass response_model for containers, e.g. List[schemas.EventResponse].
+    """
+    media_type = "application/json"
+
+    def __init__(self, content: Any, response_model: Optional[Any] = None, **kwargs):
+        self.response_model = response_model or type(content)
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        return model_adapter(self.response_model).dump_json(content)
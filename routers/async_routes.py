@@ -0,0 +1,77 @@
+import inspect
+
+from fastapi import APIRouter, Depends, Response, params
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import auth
+from database import get_db, get_async_db
+
+def make_async_router(router: APIRouter) -> APIRouter:
+    """
+    Build an async copy of a sync router for DB_ASYNC mode.
+    Each handler keeps its sync body but runs through AsyncSession.run_sync, so database
+    I/O is awaited on the event loop instead of holding a threadpool thread per request.
+    """
+    async_router = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            async_router.routes.append(route)
+            continue
+        async_router.add_api_route(
+            route.path,
+            _async_endpoint(route),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            response_description=route.response_description,
+            responses=route.responses,
+            deprecated=route.deprecated,
+            methods=route.methods,
+            name=route.name,
+            include_in_schema=route.include_in_schema,
+            response_class=route.response_class,
+        )
+    return async_router
+
+def _async_endpoint(route: APIRoute):
+    endpoint = route.endpoint
+    if inspect.iscoroutinefunction(endpoint):
+        # Already async (e.g. streaming uploads); it manages its own sync session
+        return endpoint
+    signature = inspect.signature(endpoint)
+    db_param = None
+    parameters = []
+    for param in signature.parameters.values():
+        dependency = param.default.dependency if isinstance(param.default, params.Depends) else None
+        if dependency is get_db:
+            db_param = param.name
+            param = param.replace(default=Depends(get_async_db), annotation=AsyncSession)
+        elif dependency is auth.get_current_user:
+            param = param.replace(default=Depends(auth.get_current_user_async))
+        parameters.append(param)
+    if db_param is None:
+        return endpoint
+
+    # Serialize inside the greenlet: lazy loads can't run once run_sync has returned
+    adapter = TypeAdapter(route.response_model) if route.response_model else None
+
+    async def async_endpoint(**kwargs):
+        db = kwargs.pop(db_param)
+
+        def call(session):
+            result = endpoint(**kwargs, **{db_param: session})
+            if adapter is None or isinstance(result, Response):
+                return result
+            return adapter.validate_python(result, from_attributes=True)
+
+        return await db.run_sync(call)
+
+    async_endpoint.__name__ = endpoint.__name__
+    async_endpoint.__doc__ = endpoint.__doc__
+    async_endpoint.__signature__ = signature.replace(parameters=parameters)
+    return async_endpoint
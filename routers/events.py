@@ -1,126 +1,240 @@
 from fastapi import File, UploadFile
 # Upload event banner endpoint
 
+import logging
 import os
-import time
+import tempfile
 from typing import Optional
 
-from supabase import create_client
-import boto3
-
-session = boto3.session.Session()
-
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
-supabase = None
-if SUPABASE_URL and SUPABASE_SERVICE_KEY:
-    supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
-
-# Helper to save banner to Supabase Storage or local
-def save_banner(file, event_id: int) -> Optional[str]:
-    """
-    Saves a file to Supabase Storage bucket 'banners' if configured, else to local uploads/ folder.
-    Returns the public URL or local path.
-    """
-    timestamp = int(time.time())
-    ext = os.path.splitext(file.filename)[-1]
-    filename = f"event_{event_id}_{timestamp}{ext}"
-    bucket_name = "banners"
-    if supabase:
-        file.file.seek(0)
-        content = file.file.read()
-        res = supabase.storage.from_(bucket_name).upload(filename, content, {"content-type": file.content_type})
-        if res.get("error"):
-            print(f"Supabase upload failed: {res['error']['message']}")
-            file.file.seek(0)  # Reset file pointer for local save
-        else:
-            public_url = supabase.storage.from_(bucket_name).get_public_url(filename)
-            return public_url['publicURL'] if 'publicURL' in public_url else None
-    # Fallback: save to local uploads/
-    upload_dir = os.path.join(os.getcwd(), "uploads")
-    os.makedirs(upload_dir, exist_ok=True)
-    local_path = os.path.join(upload_dir, filename)
-    with open(local_path, "wb") as out_file:
-        out_file.write(file.file.read())
-    return local_path
-    # Fallback: save to local uploads/
-    # upload_dir = os.path.join(os.getcwd(), "uploads")
-    # os.makedirs(upload_dir, exist_ok=True)
-    # local_path = os.path.join(upload_dir, filename)
-    # with open(local_path, "wb") as out_file:
-    #     out_file.write(file.file.read())
-    # return local_path
+from fastapi.concurrency import run_in_threadpool
 
 
 # RSVP endpoint: POST /events/{event_id}/rsvp
 
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Path, Query, Request
+from sqlalchemy import cast, func, literal, select, tuple_, update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, Iterable, List, Literal
 
 
 # RSVP endpoint: POST /events/{id}/rsvp
 
-from datetime import datetime
+from datetime import datetime, time
 
-import models, schemas, auth
+import models, schemas, auth, bulk, database, geo, images, pagination, rsvp_counts, search, storage
+from cache import response_cache
+from responses import ModelResponse
 from database import get_db
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/events",
     tags=["events"]
 )
 
-@router.post("/{event_id}/upload", response_model=schemas.EventResponse)
-def upload_event_banner(event_id: int, file: UploadFile = File(...), db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
-    event = db.query(models.Event).filter(models.Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
-    # Only organizer can upload banner
-    if event.organizer_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to upload banner for this event")
-    banner_url = save_banner(file, event_id)
-    event.banner_url = banner_url
-    db.commit()
-    db.refresh(event)
-    # Compose RSVP info for response
-    rsvp_count = db.query(models.RSVP).filter_by(event_id=event_id, status="yes").count()
-    rsvp = db.query(models.RSVP).filter_by(event_id=event_id, user_id=current_user.id).first()
-    rsvp_status = rsvp.status if rsvp else None
+# Response cache tag for GET /events/ pages; any event write must invalidate it
+EVENTS_CACHE_TAG = "events"
+
+def load_rsvp_statuses(db: Session, event_ids: Iterable[int], user_id: Optional[int] = None) -> Dict[int, str]:
+    """
+    Fetch the viewer's RSVP status for many events in one query. Counts come from the
+    events' denormalized counters, so anonymous reads don't touch rsvps at all.
+    Returns {event_id: rsvp_status}; events the viewer hasn't RSVPed to are left out.
+    """
+    event_ids = list(event_ids)
+    if user_id is None or not event_ids:
+        return {}
+    rows = db.query(models.RSVP.event_id, models.RSVP.status).filter(
+        models.RSVP.user_id == user_id,
+        models.RSVP.event_id.in_(event_ids)
+    ).all()
+    return dict(rows)
+
+def build_event_responses(db: Session, events: List[models.Event], user_id: Optional[int] = None) -> List[schemas.EventResponse]:
+    """Serialize events with the viewer's RSVP statuses loaded in a single query for the whole batch."""
+    statuses = load_rsvp_statuses(db, [e.id for e in events], user_id)
+    return [event_response(e, statuses.get(e.id)) for e in events]
+
+def event_response(event: models.Event, rsvp_status: Optional[str] = None, organizer: Optional[models.User] = None) -> schemas.EventResponse:
+    """Build the response from an Event, or from any row with the events columns when `organizer` is given."""
     return schemas.EventResponse(
         id=event.id,
         title=event.title,
         description=event.description,
         date=event.date,
-        time=datetime.strptime(event.time, "%H:%M:%S").time(),
+        time=event.time,
         location=event.location,
         category=event.category,
-        organizer=schemas.UserOut.from_orm(event.organizer),
+        latitude=event.latitude,
+        longitude=event.longitude,
+        organizer=schemas.UserOut.from_orm(organizer or event.organizer),
         created_at=event.created_at,
         banner_url=event.banner_url,
-        rsvp_count=rsvp_count,
+        banner_thumb_url=event.banner_thumb_url,
+        banner_card_url=event.banner_card_url,
+        banner_full_url=event.banner_full_url,
+        rsvp_count=event.rsvp_yes_count,
+        rsvp_counts={status: getattr(event, column.key) for status, column in rsvp_counts.RSVP_COUNT_COLUMNS.items()},
         rsvp_status=rsvp_status
     )
 
+def banner_variant_key(banner_key: str, variant: str) -> str:
+    return f"{os.path.splitext(banner_key)[0]}_{variant}.webp"
+
+def stored_banner_variants(banner_key: str) -> Optional[Dict[str, str]]:
+    """URLs of the variants already rendered for this content, or None if any is missing."""
+    backend = storage.media_storage
+    keys = {name: banner_variant_key(banner_key, name) for name in images.BANNER_VARIANTS}
+    if not all(backend.exists(key) for key in keys.values()):
+        return None
+    return {name: backend.url_for(key) for name, key in keys.items()}
+
+async def process_banner(event_id: int, banner_key: str, source_path: str):
+    """Render the banner's WebP variants in the image process pool, store them and record them on the event."""
+    try:
+        variants = await run_in_threadpool(stored_banner_variants, banner_key)
+        if variants is None:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                stem = os.path.splitext(banner_key)[0]
+                paths = await images.render_banner_variants_async(source_path, tmp_dir, stem)
+                variants = {}
+                for name, path in paths.items():
+                    variants[name] = await run_in_threadpool(
+                        storage.media_storage.put, path, banner_variant_key(banner_key, name), "image/webp"
+                    )
+    except Exception:
+        logger.exception("Banner processing failed for event %s (%s)", event_id, banner_key)
+        return
+    finally:
+        os.remove(source_path)
+    await run_in_threadpool(record_banner_variants, event_id, storage.media_storage.url_for(banner_key), variants)
+
+def record_banner_variants(event_id: int, banner_url: str, variants: Dict[str, str]):
+    db = database.SessionLocal()
+    try:
+        # Skip the write if a newer banner replaced this one while it was processing
+        db.query(models.Event).filter(
+            models.Event.id == event_id,
+            models.Event.banner_url == banner_url
+        ).update({
+            models.Event.banner_thumb_url: variants["thumb"],
+            models.Event.banner_card_url: variants["card"],
+            models.Event.banner_full_url: variants["full"],
+        }, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+    response_cache.invalidate(EVENTS_CACHE_TAG)
+
+def collect_banner(banner_url: str):
+    """Delete a superseded banner and its variants once no event references the content any more."""
+    backend = storage.media_storage
+    key = backend.key_for(banner_url)
+    if key is None:
+        return
+    db = database.SessionLocal()
+    try:
+        in_use = db.query(models.Event.id).filter(models.Event.banner_url == banner_url).first()
+    finally:
+        db.close()
+    if in_use:
+        return
+    for stale_key in [key] + [banner_variant_key(key, name) for name in images.BANNER_VARIANTS]:
+        backend.delete(stale_key)
+
+# async so the upload streams on the event loop; the DB calls still go through the threadpool
+@router.post("/{event_id}/upload", response_model=schemas.EventResponse)
+async def upload_event_banner(event_id: int, background_tasks: BackgroundTasks, file: UploadFile = File(...), db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
+    event = await run_in_threadpool(lambda: db.query(models.Event).filter(models.Event.id == event_id).first())
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    # Only organizer can upload banner
+    if event.organizer_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to upload banner for this event")
+    old_banner_url = event.banner_url
+    banner_url = None
+
+    def store_banner():
+        if event.banner_url != banner_url:
+            event.banner_url = banner_url
+            event.banner_thumb_url = event.banner_card_url = event.banner_full_url = None
+            db.commit()
+            response_cache.invalidate(EVENTS_CACHE_TAG)
+            db.refresh(event)
+        # Compose RSVP info for response
+        return ModelResponse(build_event_responses(db, [event], current_user.id)[0])
+
+    staged = await storage.stage_upload(file)
+    try:
+        banner_url = await run_in_threadpool(storage.media_storage.put, staged.path, staged.key, staged.content_type)
+        response = await run_in_threadpool(store_banner)
+    except BaseException:
+        os.remove(staged.path)
+        if banner_url is not None:
+            # Stored but possibly never recorded; kept if a committed event references the same content
+            await run_in_threadpool(db.rollback)
+            await run_in_threadpool(collect_banner, banner_url)
+        raise
+    background_tasks.add_task(process_banner, event_id, staged.key, staged.path)
+    if old_banner_url and old_banner_url != banner_url:
+        background_tasks.add_task(collect_banner, old_banner_url)
+    return response
+
 
 @router.post("/{event_id}/rsvp", response_model=schemas.RSVPResponse)
 def rsvp_event(event_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
+    """
+    RSVP "yes" in one INSERT ... ON CONFLICT DO UPDATE ... RETURNING round trip. The unique
+    (user_id, event_id) index makes repeated or concurrent clicks converge on a single row,
+    and selecting from events means a missing event inserts nothing.
+    """
+    insert_rsvp = database.dialect_insert(db, models.RSVP).from_select(
+        ["user_id", "event_id", "status"],
+        select(literal(current_user.id), models.Event.id, cast(literal("yes"), models.RSVP.status.type)).where(models.Event.id == event_id)
+    )
+    upsert = insert_rsvp.on_conflict_do_update(
+        index_elements=[models.RSVP.user_id, models.RSVP.event_id],
+        set_={"status": insert_rsvp.excluded.status}
+    ).returning(models.RSVP.id, models.RSVP.user_id, models.RSVP.event_id, models.RSVP.status, models.RSVP.created_at)
+    rsvp = db.execute(upsert).mappings().first()
+    db.commit()
+    if not rsvp:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return schemas.RSVPResponse(**rsvp)
+
+
+
+@router.post("/{event_id}/rsvps/bulk", response_model=schemas.BulkResult)
+def bulk_rsvp(event_id: int, batch: schemas.BulkRSVPRequest, db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
+    """
+    Import attendees: RSVP up to BULK_MAX_ITEMS users at once. Items are validated in one
+    pass and written with a single multi-row upsert in one transaction; the response has
+    one result per item, in request order. Only the organizer can import.
+    """
     event = db.query(models.Event).filter(models.Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
+    if event.organizer_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to import RSVPs for this event")
 
-    rsvp = db.query(models.RSVP).filter_by(user_id=current_user.id, event_id=event_id).first()
-    if rsvp:
-        rsvp.status = "yes"
-    else:
-        rsvp = models.RSVP(user_id=current_user.id, event_id=event_id, status="yes")
-        db.add(rsvp)
+    user_ids = [item.user_id for item in batch.items]
+    errors = bulk.check_user_ids(db, user_ids)
+    rows = [
+        {"user_id": item.user_id, "event_id": event_id, "status": item.status}
+        for index, item in enumerate(batch.items) if index not in errors
+    ]
+    written = {}
+    if rows:
+        insert_rsvps = database.dialect_insert(db, models.RSVP).values(rows)
+        upsert = insert_rsvps.on_conflict_do_update(
+            index_elements=[models.RSVP.user_id, models.RSVP.event_id],
+            set_={"status": insert_rsvps.excluded.status}
+        ).returning(models.RSVP.user_id, models.RSVP.id)
+        written = dict(db.execute(upsert).all())
     db.commit()
-    db.refresh(rsvp)
-    return schemas.RSVPResponse.from_orm(rsvp)
-
-
+    return bulk.bulk_result(user_ids, errors, written, "RSVP not written")
 
 # Cancel RSVP endpoint: DELETE /events/{event_id}/rsvp
 @router.delete("/{event_id}/rsvp")
@@ -138,20 +252,7 @@ def my_registrations(db: Session = Depends(get_db), current_user: models.User =
     rsvps = db.query(models.RSVP).filter_by(user_id=current_user.id).all()
     event_ids = [rsvp.event_id for rsvp in rsvps]
     events = db.query(models.Event).filter(models.Event.id.in_(event_ids)).all() if event_ids else []
-    return [
-        schemas.EventResponse(
-            id=e.id,
-            title=e.title,
-            description=e.description,
-            date=e.date,
-            time=datetime.strptime(e.time, "%H:%M:%S").time(),
-            location=e.location,
-            category=e.category,
-            organizer=schemas.UserOut.from_orm(e.organizer),
-            created_at=e.created_at,
-            banner_url=e.banner_url
-        ) for e in events
-    ]
+    return ModelResponse(build_event_responses(db, events, current_user.id), List[schemas.EventResponse])
     
     
 @router.post("/", response_model=schemas.EventResponse)
@@ -160,31 +261,22 @@ def create_event(event: schemas.EventCreate, db: Session = Depends(get_db), curr
         title=event.title,
         description=event.description,
         date=event.date,
-        time=event.time.strftime("%H:%M:%S"),
+        time=event.time,
         location=event.location,
         category=event.category,
-        organizer_id=current_user.id
+        organizer_id=current_user.id,
+        **geo.coordinates_for(event.location)
     )
     db.add(db_event)
     db.commit()
+    response_cache.invalidate(EVENTS_CACHE_TAG)
     db.refresh(db_event)
-    return schemas.EventResponse(
-        id=db_event.id,
-        title=db_event.title,
-        description=db_event.description,
-        date=db_event.date,
-        time=datetime.strptime(db_event.time, "%H:%M:%S").time(),
-        location=db_event.location,
-        category=db_event.category,
-        organizer=schemas.UserOut.from_orm(db_event.organizer),
-        created_at=db_event.created_at,
-        banner_url=db_event.banner_url
-    )
+    return ModelResponse(event_response(db_event))
 
 @router.put("/{event_id}", response_model=schemas.EventResponse)
 def update_event(
-    event_id: int, 
-    event_update: schemas.EventUpdate, 
+    event_id: int = Path(..., gt=0),
+    event_update: schemas.EventUpdate = Body(...),
     db: Session = Depends(get_db), 
     current_user: models.User = Depends(auth.get_current_user)
 ):
@@ -193,175 +285,82 @@ def update_event(
     All fields are optional - only provided fields will be updated.
     
     Time format: Accepts both "HH:MM:SS" and ISO format like "2025-09-08T02:01:44.542Z"
+
+    Fields are validated by EventUpdate, so the edit is a single UPDATE ... RETURNING with
+    ownership in the WHERE clause, plus the commit. The response is built from the returned
+    row; the organizer is the current user and the viewer's RSVP status comes back as a
+    scalar subquery in the same statement.
     """
+    viewer_status = select(models.RSVP.status).where(
+        models.RSVP.event_id == models.Event.id,
+        models.RSVP.user_id == current_user.id
+    ).scalar_subquery().label("rsvp_status")
+    values = event_update.model_dump(exclude_unset=True)
+    if "location" in values:
+        values.update(geo.coordinates_for(values["location"]))
+    statement = update(models.Event).where(
+        models.Event.id == event_id,
+        models.Event.organizer_id == current_user.id
+    ).values(**values).returning(*models.Event.__table__.c, viewer_status)
     try:
-        # Validate event_id
-        if not isinstance(event_id, int) or event_id <= 0:
-            raise HTTPException(status_code=400, detail="Invalid event ID. Must be a positive integer.")
-        
-        # Find the event
-        try:
-            event = db.query(models.Event).filter(models.Event.id == event_id).first()
-        except Exception as e:
-            raise HTTPException(status_code=500, detail="Database error while retrieving event.")
-        
-        if not event:
-            raise HTTPException(status_code=404, detail="Event not found")
-        
-        # Check if current user is the organizer
-        if event.organizer_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Not authorized to update this event. Only the event organizer can update their event.")
-        
-        # Update only the fields that are provided
-        try:
-            update_data = event_update.dict(exclude_unset=True)
-        except Exception as e:
-            raise HTTPException(status_code=400, detail="Invalid request data format.")
-        
-        # Validate that at least one field is provided for update
-        if not update_data:
-            raise HTTPException(status_code=400, detail="No fields provided for update. At least one field must be specified.")
-        
-        # Process each field with proper validation
-        for field, value in update_data.items():
-            try:
-                if field == "date" and value is not None:
-                    # Handle date field - convert string to date object
-                    if isinstance(value, str):
-                        # Validate date string format
-                        if not value.strip():
-                            raise ValueError("Date cannot be empty")
-                        # Parse the date string
-                        parsed_date = datetime.strptime(value, "%Y-%m-%d").date()
-                        # Validate that the date is not in the past (optional business rule)
-                        if parsed_date < datetime.now().date():
-                            raise ValueError("Event date cannot be in the past")
-                        setattr(event, field, parsed_date)
-                    else:
-                        setattr(event, field, value)
-                        
-                elif field == "time" and value is not None:
-                    # Handle time field - it should be a string in HH:MM:SS format
-                    if isinstance(value, str):
-                        if not value.strip():
-                            raise ValueError("Time cannot be empty")
-                        # Validate and format the time string
-                        try:
-                            # Try to parse the time to validate format
-                            if "T" in value:  # Handle ISO format like "02:01:44.542Z"
-                                # Extract just the time part
-                                time_part = value.split("T")[1].split("Z")[0].split(".")[0]
-                                # Validate the extracted time format
-                                datetime.strptime(time_part, "%H:%M:%S")
-                                setattr(event, field, time_part)
-                            else:
-                                # Validate standard HH:MM:SS format
-                                datetime.strptime(value, "%H:%M:%S")
-                                setattr(event, field, value)
-                        except ValueError as ve:
-                            raise ValueError(f"Invalid time format. Use HH:MM:SS or ISO format. Error: {str(ve)}")
-                    else:
-                        # If it's not a string, convert to string
-                        setattr(event, field, str(value))
-                        
-                elif field == "title" and value is not None:
-                    # Validate title
-                    if not isinstance(value, str) or not value.strip():
-                        raise ValueError("Title must be a non-empty string")
-                    if len(value.strip()) > 200:  # Reasonable title length limit
-                        raise ValueError("Title must be 200 characters or less")
-                    setattr(event, field, value.strip())
-                    
-                elif field == "description" and value is not None:
-                    # Validate description
-                    if value is not None and not isinstance(value, str):
-                        raise ValueError("Description must be a string")
-                    if value and len(value) > 2000:  # Reasonable description length limit
-                        raise ValueError("Description must be 2000 characters or less")
-                    setattr(event, field, value.strip() if value else None)
-                    
-                elif field == "location" and value is not None:
-                    # Validate location
-                    if not isinstance(value, str) or not value.strip():
-                        raise ValueError("Location must be a non-empty string")
-                    if len(value.strip()) > 500:  # Reasonable location length limit
-                        raise ValueError("Location must be 500 characters or less")
-                    setattr(event, field, value.strip())
-                    
-                elif field == "category" and value is not None:
-                    # Validate category
-                    if value is not None and not isinstance(value, str):
-                        raise ValueError("Category must be a string")
-                    if value and len(value.strip()) > 100:  # Reasonable category length limit
-                        raise ValueError("Category must be 100 characters or less")
-                    setattr(event, field, value.strip() if value else None)
-                    
-                else:
-                    # For any other fields, set them directly
-                    setattr(event, field, value)
-                    
-            except ValueError as ve:
-                raise HTTPException(status_code=400, detail=f"Validation error for field '{field}': {str(ve)}")
-            except Exception as e:
-                raise HTTPException(status_code=400, detail=f"Error processing field '{field}': {str(e)}")
-        
-        # Save changes to database
-        try:
-            db.commit()
-            db.refresh(event)
-        except Exception as e:
+        row = db.execute(statement, execution_options={"synchronize_session": False}).first()
+        if row is None:
+            # Nothing matched: tell a missing event from someone else's
+            organizer_id = db.query(models.Event.organizer_id).filter(models.Event.id == event_id).scalar()
             db.rollback()
-            raise HTTPException(status_code=500, detail="Database error while saving changes. Please try again.")
-        
-        # Get RSVP info for response
-        try:
-            rsvp_count = db.query(models.RSVP).filter_by(event_id=event_id, status="yes").count()
-            rsvp = db.query(models.RSVP).filter_by(event_id=event_id, user_id=current_user.id).first()
-            rsvp_status = rsvp.status if rsvp else None
-        except Exception as e:
-            # If RSVP query fails, continue with default values
-            rsvp_count = 0
-            rsvp_status = None
-        
-        # Build response
-        try:
-            return schemas.EventResponse(
-                id=event.id,
-                title=event.title,
-                description=event.description,
-                date=event.date,
-                time=datetime.strptime(event.time, "%H:%M:%S").time(),
-                location=event.location,
-                category=event.category,
-                organizer=schemas.UserOut.from_orm(event.organizer),
-                created_at=event.created_at,
-                banner_url=event.banner_url,
-                rsvp_count=rsvp_count,
-                rsvp_status=rsvp_status
-            )
-        except Exception as e:
-            raise HTTPException(status_code=500, detail="Error building response. Please try again.")
-            
+            if organizer_id is None:
+                raise HTTPException(status_code=404, detail="Event not found")
+            raise HTTPException(status_code=403, detail="Not authorized to update this event. Only the event organizer can update their event.")
+        # Serialize before the commit expires current_user
+        response = event_response(row, row.rsvp_status, organizer=current_user)
+        db.commit()
     except HTTPException:
-        # Re-raise HTTP exceptions as they are already properly formatted
         raise
     except Exception as e:
-        # Catch any unexpected errors
-        raise HTTPException(status_code=500, detail="An unexpected error occurred. Please try again later.")
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Database error while saving changes. Please try again.")
+    response_cache.invalidate(EVENTS_CACHE_TAG)
+    return ModelResponse(response)
 
-@router.get("/", response_model=List[schemas.EventResponse])
+@router.get("/", response_model=schemas.EventPage)
 def list_events(
+    request: Request,
     city: Optional[str] = None,
     category: Optional[str] = None,
     date: Optional[str] = None,
+    starts_after: Optional[time] = Query(None, description="Only events starting at or after this time (HH:MM[:SS])"),
+    near: Optional[str] = Query(None, description="Only events within radius_km of this point (lat,lon)"),
+    radius_km: float = Query(geo.DEFAULT_RADIUS_KM, gt=0, le=geo.MAX_RADIUS_KM),
+    cursor: Optional[str] = None,
+    limit: int = Query(pagination.DEFAULT_PAGE_SIZE, ge=1, le=pagination.MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
 ):
     """
-    Get list of events with optional filters:
+    Get list of events with optional filters, one page at a time:
     - city: Filter by city (searches in location field)
     - category: Filter by event category
     - date: Filter by date (YYYY-MM-DD format)
+    - starts_after: Filter by start time (HH:MM[:SS]), inclusive
+    - near, radius_km: Filter to events within radius_km of a point given as "lat,lon"
+    - cursor: next_cursor from the previous page
+    - limit: Page size
     """
+    return response_cache.respond(
+        request, schemas.EventPage, [EVENTS_CACHE_TAG],
+        lambda: find_events(db, city, category, date, cursor, limit, starts_after, near, radius_km)
+    )
+
+def find_events(
+    db: Session,
+    city: Optional[str],
+    category: Optional[str],
+    date: Optional[str],
+    cursor: Optional[str],
+    limit: int,
+    starts_after: Optional[time] = None,
+    near: Optional[str] = None,
+    radius_km: float = geo.DEFAULT_RADIUS_KM
+) -> schemas.EventPage:
     query = db.query(models.Event)
     
     # Apply filters
@@ -378,61 +377,110 @@ def list_events(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
-    events = query.order_by(models.Event.date).all()
+    if starts_after:
+        query = query.filter(models.Event.time >= starts_after)
     
-    return [
-        schemas.EventResponse(
-            id=e.id,
-            title=e.title,
-            description=e.description,
-            date=e.date,
-            time=datetime.strptime(e.time, "%H:%M:%S").time(),
-            location=e.location,
-            category=e.category,
-            organizer=schemas.UserOut.from_orm(e.organizer),
-            created_at=e.created_at,
-            banner_url=e.banner_url
-        ) for e in events
-    ]
+    if near:
+        point = geo.parse_point(near)
+        if point is None:
+            raise HTTPException(status_code=400, detail="Invalid near. Use lat,lon")
+        query = query.filter(geo.near_clause(db, *point, radius_km))
+    
+    if cursor:
+        after_date, after_time, after_id = pagination.decode_cursor(cursor, (str, str, int))
+        try:
+            after_date = datetime.fromisoformat(after_date)
+            after_time = time.fromisoformat(after_time)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(
+            tuple_(models.Event.date, models.Event.time, models.Event.id) > (after_date, after_time, after_id)
+        )
+    
+    events = query.order_by(models.Event.date, models.Event.time, models.Event.id).limit(limit + 1).all()
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        last = events[-1]
+        next_cursor = pagination.encode_cursor(last.date.isoformat(), last.time.isoformat(), last.id)
+    
+    return schemas.EventPage(items=build_event_responses(db, events), next_cursor=next_cursor)
     
 
+@router.get("/search", response_model=schemas.EventSearchPage)
+def search_events(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms; supports \"quoted phrases\", or and -exclusions"),
+    limit: int = Query(pagination.DEFAULT_PAGE_SIZE, ge=1, le=pagination.MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=10000),
+    db: Session = Depends(get_db)
+):
+    """
+    Ranked full-text search over title, description, location and category.
+    Results are ordered by relevance; pass next_offset as `offset` for the following page.
+    """
+    def build():
+        hits = search.search_events(db, q, limit + 1, offset)
+        next_offset = offset + limit if len(hits) > limit else None
+        responses = build_event_responses(db, [hit.event for hit in hits[:limit]])
+        return schemas.EventSearchPage(
+            items=[
+                schemas.EventSearchResult(**response.model_dump(), rank=hit.rank, snippet=hit.snippet)
+                for response, hit in zip(responses, hits)
+            ],
+            next_offset=next_offset
+        )
+
+    return response_cache.respond(request, schemas.EventSearchPage, [EVENTS_CACHE_TAG], build)
+
 @router.get("/{event_id}", response_model=schemas.EventResponse)
 def get_event(event_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
     event = db.query(models.Event).filter(models.Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    rsvp_count = db.query(models.RSVP).filter_by(event_id=event_id, status="yes").count()
-    rsvp = db.query(models.RSVP).filter_by(event_id=event_id, user_id=current_user.id).first()
-    rsvp_status = rsvp.status if rsvp else None
-    return schemas.EventResponse(
-        id=event.id,
-        title=event.title,
-        description=event.description,
-        date=event.date,
-        time=datetime.strptime(event.time, "%H:%M:%S").time(),
-        location=event.location,
-        category=event.category,
-        organizer=schemas.UserOut.from_orm(event.organizer),
-        created_at=event.created_at,
-        banner_url=event.banner_url,
-        rsvp_count=rsvp_count,
-        rsvp_status=rsvp_status
-    )
+    return ModelResponse(build_event_responses(db, [event], current_user.id)[0])
 
 # List users by RSVP status for an event
 @router.get("/{event_id}/rsvps")
-def list_event_rsvps(event_id: int, db: Session = Depends(get_db)):
-    rsvps = db.query(models.RSVP).filter(models.RSVP.event_id == event_id).all()
+def list_event_rsvps(
+    event_id: int,
+    status: Optional[Literal["yes", "no", "maybe"]] = None,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum users returned per status"),
+    offset: int = Query(0, ge=0, description="Users to skip per status"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get users grouped by RSVP status, paged per status in a single query:
+    - status: Only return users with this RSVP status
+    - limit: Maximum users returned per status
+    - offset: Users to skip per status
+    """
+    position = func.row_number().over(
+        partition_by=models.RSVP.status,
+        order_by=models.RSVP.id
+    ).label("position")
+    query = db.query(
+        models.RSVP.status.label("status"),
+        models.User.id.label("id"),
+        models.User.name.label("name"),
+        models.User.email.label("email"),
+        position
+    ).join(models.User, models.User.id == models.RSVP.user_id).filter(models.RSVP.event_id == event_id)
+    if status:
+        query = query.filter(models.RSVP.status == status)
+    ranked = query.subquery()
+    rows = db.query(ranked).filter(
+        ranked.c.position > offset,
+        ranked.c.position <= offset + limit
+    ).order_by(ranked.c.status, ranked.c.position).all()
+
     users_by_status = {"yes": [], "no": [], "maybe": []}
-    for rsvp in rsvps:
-        if rsvp.status in users_by_status:
-            user = db.query(models.User).filter(models.User.id == rsvp.user_id).first()
-            if user:
-                users_by_status[rsvp.status].append({
-                    "id": user.id,
-                    "name": user.name,
-                    "email": user.email
-                })
+    for row in rows:
+        users_by_status[row.status].append({
+            "id": row.id,
+            "name": row.name,
+            "email": row.email
+        })
     return users_by_status
 
 # Organizer endpoints
@@ -448,40 +496,8 @@ def get_my_events(db: Session = Depends(get_db), current_user: models.User = Dep
             models.Event.organizer_id == current_user.id
         ).order_by(models.Event.date).all()
         
-        # Build response with RSVP information
-        result = []
-        for event in events:
-            try:
-                # Get RSVP count for this event
-                rsvp_count = db.query(models.RSVP).filter_by(
-                    event_id=event.id, status="yes"
-                ).count()
-                
-                # Get current user's RSVP status for this event
-                rsvp = db.query(models.RSVP).filter_by(
-                    event_id=event.id, user_id=current_user.id
-                ).first()
-                rsvp_status = rsvp.status if rsvp else None
-                
-                result.append(schemas.EventResponse(
-                    id=event.id,
-                    title=event.title,
-                    description=event.description,
-                    date=event.date,
-                    time=datetime.strptime(event.time, "%H:%M:%S").time(),
-                    location=event.location,
-                    category=event.category,
-                    organizer=schemas.UserOut.from_orm(event.organizer),
-                    created_at=event.created_at,
-                    banner_url=event.banner_url,
-                    rsvp_count=rsvp_count,
-                    rsvp_status=rsvp_status
-                ))
-            except Exception as e:
-                # If there's an error with a specific event, skip it and continue
-                continue
-        
-        return result
+        # Build response with RSVP information for all events in one query
+        return ModelResponse(build_event_responses(db, events, current_user.id), List[schemas.EventResponse])
         
     except Exception as e:
         raise HTTPException(status_code=500, detail="Error retrieving your events. Please try again.")
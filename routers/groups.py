@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from typing import List
-import models, schemas, auth
+from typing import List, Optional
+import models, schemas, auth, bulk, database, pagination
+from cache import response_cache
 from database import get_db
 
 router = APIRouter(
@@ -9,30 +10,38 @@ router = APIRouter(
     tags=["groups"]
 )
 
+# Response cache tags for the public group reads
+GROUPS_CACHE_TAG = "groups"
+
+def group_cache_tag(group_id: int) -> str:
+    return f"group:{group_id}"
+
+def group_members_cache_tag(group_id: int) -> str:
+    return f"group:{group_id}:members"
+
 @router.post("/", response_model=schemas.GroupOut)
 def create_group(group: schemas.GroupCreate, db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
-    # Check if group name already exists
-    existing_group = db.query(models.Group).filter(models.Group.name == group.name).first()
-    if existing_group:
-        raise HTTPException(status_code=400, detail="Group name already exists")
-    
-    # Create new group
-    db_group = models.Group(
+    """
+    Create a group and its owner's membership in one transaction. The unique index on
+    groups.name decides duplicates: ON CONFLICT DO NOTHING returns no row for a taken name.
+    """
+    insert_group = database.dialect_insert(db, models.Group).values(
         name=group.name,
         description=group.description,
         avatar_url=group.avatar_url,
         owner_id=current_user.id
-    )
-    db.add(db_group)
-    db.commit()
-    db.refresh(db_group)
-    
+    ).on_conflict_do_nothing(index_elements=[models.Group.name]).returning(*models.Group.__table__.c)
+    db_group = db.execute(insert_group).mappings().first()
+    if not db_group:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Group name already exists")
+
     # Automatically add the creator as a member
-    member = models.GroupMember(group_id=db_group.id, user_id=current_user.id)
-    db.add(member)
+    db.execute(database.dialect_insert(db, models.GroupMember).values(group_id=db_group["id"], user_id=current_user.id))
     db.commit()
-    
-    return db_group
+    response_cache.invalidate(GROUPS_CACHE_TAG, group_members_cache_tag(db_group["id"]))
+
+    return schemas.GroupOut(**db_group)
 
 @router.post("/{group_id}/join", response_model=schemas.GroupMemberOut)
 def join_group(group_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
@@ -46,9 +55,39 @@ def join_group(group_id: int, db: Session = Depends(get_db), current_user: model
     member = models.GroupMember(group_id=group_id, user_id=current_user.id)
     db.add(member)
     db.commit()
+    response_cache.invalidate(group_members_cache_tag(group_id))
     db.refresh(member)
     return member
 
+@router.post("/{group_id}/members/bulk", response_model=schemas.BulkResult)
+def bulk_join_group(group_id: int, batch: schemas.BulkJoinRequest, db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
+    """
+    Onboard a team: add up to BULK_MAX_ITEMS users at once with a single multi-row insert in
+    one transaction. Existing members are reported per item rather than failing the batch.
+    Only the group owner can add members.
+    """
+    group = db.query(models.Group).filter(models.Group.id == group_id).first()
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
+    if group.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to add members to this group")
+
+    errors = bulk.check_user_ids(db, batch.user_ids)
+    rows = [
+        {"group_id": group_id, "user_id": user_id}
+        for index, user_id in enumerate(batch.user_ids) if index not in errors
+    ]
+    written = {}
+    if rows:
+        insert_members = database.dialect_insert(db, models.GroupMember).values(rows).on_conflict_do_nothing(
+            index_elements=[models.GroupMember.group_id, models.GroupMember.user_id]
+        ).returning(models.GroupMember.user_id, models.GroupMember.id)
+        written = dict(db.execute(insert_members).all())
+    db.commit()
+    if written:
+        response_cache.invalidate(group_members_cache_tag(group_id))
+    return bulk.bulk_result(batch.user_ids, errors, written, "Already a member")
+
 @router.get("/my-groups", response_model=List[schemas.GroupOut])
 def my_groups(db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
     memberships = db.query(models.GroupMember).filter_by(user_id=current_user.id).all()
@@ -56,23 +95,48 @@ def my_groups(db: Session = Depends(get_db), current_user: models.User = Depends
     groups = db.query(models.Group).filter(models.Group.id.in_(group_ids)).all() if group_ids else []
     return groups
 
-@router.get("/", response_model=List[schemas.GroupOut])
-def get_all_groups(db: Session = Depends(get_db)):
-    """Get all groups"""
-    groups = db.query(models.Group).all()
-    return groups
+@router.get("/", response_model=schemas.GroupPage)
+def get_all_groups(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(pagination.DEFAULT_PAGE_SIZE, ge=1, le=pagination.MAX_PAGE_SIZE),
+    db: Session = Depends(get_db)
+):
+    """
+    Get all groups, one page at a time, ordered by ID.
+    Pass the returned next_cursor as `cursor` to fetch the following page.
+    """
+    def build():
+        query = db.query(models.Group)
+        if cursor:
+            (after_id,) = pagination.decode_cursor(cursor, (int,))
+            query = query.filter(models.Group.id > after_id)
+        groups = query.order_by(models.Group.id).limit(limit + 1).all()
+        next_cursor = None
+        if len(groups) > limit:
+            groups = groups[:limit]
+            next_cursor = pagination.encode_cursor(groups[-1].id)
+        return schemas.GroupPage(items=groups, next_cursor=next_cursor)
+
+    return response_cache.respond(request, schemas.GroupPage, [GROUPS_CACHE_TAG], build)
 
 @router.get("/{group_id}", response_model=schemas.GroupOut)
-def get_group(group_id: int, db: Session = Depends(get_db)):
+def get_group(group_id: int, request: Request, db: Session = Depends(get_db)):
     """Get a specific group by ID"""
-    group = db.query(models.Group).filter(models.Group.id == group_id).first()
-    if not group:
-        raise HTTPException(status_code=404, detail="Group not found")
-    return group
+    def build():
+        group = db.query(models.Group).filter(models.Group.id == group_id).first()
+        if not group:
+            raise HTTPException(status_code=404, detail="Group not found")
+        return group
+
+    return response_cache.respond(request, schemas.GroupOut, [group_cache_tag(group_id)], build)
 
 @router.get("/{group_id}/members", response_model=List[schemas.UserOut])
-def group_members(group_id: int, db: Session = Depends(get_db)):
-    members = db.query(models.GroupMember).filter_by(group_id=group_id).all()
-    user_ids = [m.user_id for m in members]
-    users = db.query(models.User).filter(models.User.id.in_(user_ids)).all() if user_ids else []
-    return users
+def group_members(group_id: int, request: Request, db: Session = Depends(get_db)):
+    def build():
+        members = db.query(models.GroupMember).filter_by(group_id=group_id).all()
+        user_ids = [m.user_id for m in members]
+        users = db.query(models.User).filter(models.User.id.in_(user_ids)).all() if user_ids else []
+        return users
+
+    return response_cache.respond(request, List[schemas.UserOut], [group_members_cache_tag(group_id)], build)
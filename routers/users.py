@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
 import models, schemas, auth, database
@@ -6,24 +7,40 @@ from database import get_db
 
 router = APIRouter()
 
+def _find_user(db: Session, email: str):
+    return db.query(models.User).filter(models.User.email == email).first()
+
+def _insert_user(db: Session, name: str, email: str, password_hash: str):
+    """
+    Insert and commit a user in one INSERT ... ON CONFLICT DO NOTHING RETURNING round trip;
+    the unique index on email decides duplicates, so None means the email is taken.
+    """
+    insert_user = database.dialect_insert(db, models.User).values(
+        name=name, email=email, password_hash=password_hash
+    ).on_conflict_do_nothing(index_elements=[models.User.email]).returning(*models.User.__table__.c)
+    row = db.execute(insert_user).mappings().first()
+    db.commit()
+    return row
+
+# register and login are async so bcrypt waits on its process pool without holding a threadpool thread;
+# the short DB calls still go through the threadpool
 @router.post("/register", response_model=schemas.UserOut)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.email == user.email).first()
-    if db_user:
+async def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+    hashed_password = await auth.get_password_hash_async(user.password)
+    new_user = await run_in_threadpool(_insert_user, db, user.name, user.email, hashed_password)
+    if not new_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    hashed_password = auth.get_password_hash(user.password)
-    new_user = models.User(name=user.name, email=user.email, password_hash=hashed_password)
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+    return schemas.UserOut(**new_user)
 
 @router.post("/login")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
-    if not user or not auth.verify_password(form_data.password, user.password_hash):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_find_user, db, form_data.username)
+    if not user or not await auth.verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     access_token = auth.create_access_token(data={"sub": user.email})
+    if auth.password_needs_rehash(user.password_hash):
+        user.password_hash = await auth.get_password_hash_async(form_data.password)
+        await run_in_threadpool(db.commit)
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=schemas.UserOut)
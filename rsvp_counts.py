@@ -0,0 +1,47 @@
+"""
+Denormalized per-status RSVP counters on events.
+
+Triggers on rsvps (see models.py) adjust the matching events.rsvp_*_count column within
+the writing statement, so counters commit or roll back together with the RSVP however it
+was written. reconcile_rsvp_counts recomputes the counters from rsvps and repairs drift;
+run it periodically with `python rsvp_counts.py`.
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import case, func, or_, select, update
+
+import models, database
+
+RSVP_COUNT_COLUMNS = {
+    "yes": models.Event.rsvp_yes_count,
+    "no": models.Event.rsvp_no_count,
+    "maybe": models.Event.rsvp_maybe_count,
+}
+
+def reconcile_rsvp_counts(db, event_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute counters from rsvps, rewrite the events that drifted and return how many there were."""
+    actual = select(
+        models.RSVP.event_id,
+        *(func.count(case((models.RSVP.status == status, 1))).label(status) for status in RSVP_COUNT_COLUMNS)
+    ).group_by(models.RSVP.event_id).subquery()
+    expected = {status: func.coalesce(actual.c[status], 0) for status in RSVP_COUNT_COLUMNS}
+    query = select(models.Event.id, *(expected[status].label(status) for status in RSVP_COUNT_COLUMNS)).outerjoin(
+        actual, actual.c.event_id == models.Event.id
+    ).where(or_(*(column != expected[status] for status, column in RSVP_COUNT_COLUMNS.items())))
+    if event_ids is not None:
+        query = query.where(models.Event.id.in_(list(event_ids)))
+    drifted = db.execute(query).all()
+    if drifted:
+        db.execute(update(models.Event), [
+            {"id": row.id, **{column.key: row._mapping[status] for status, column in RSVP_COUNT_COLUMNS.items()}}
+            for row in drifted
+        ])
+    db.commit()
+    return len(drifted)
+
+if __name__ == "__main__":
+    session = database.SessionLocal()
+    try:
+        print(f"Repaired RSVP counters on {reconcile_rsvp_counts(session)} events")
+    finally:
+        session.close()
@@ -1,10 +1,10 @@
 # Event Schemas
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 from datetime import date, time
 
 
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
 from datetime import datetime
 class GroupMemberCreate(BaseModel):
     group_id: int
@@ -18,22 +18,49 @@ class GroupMemberOut(BaseModel):
 
     class Config:
         from_attributes = True
+# Largest batch accepted by the bulk RSVP and bulk join endpoints
+BULK_MAX_ITEMS = 1000
+
+class BulkItemResult(BaseModel):
+    """Outcome for one item of a bulk request; `id` is the RSVP or membership row on success."""
+    user_id: int
+    ok: bool
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkResult(BaseModel):
+    results: List[BulkItemResult]
+
+class BulkJoinRequest(BaseModel):
+    user_ids: List[int] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
 class GroupCreate(BaseModel):
     name: str
-    description: str = None
-    avatar_url: str = None
+    description: Optional[str] = None
+    avatar_url: Optional[str] = None
 
 class GroupOut(BaseModel):
     id: int
     name: str
-    description: str = None
+    description: Optional[str] = None
     owner_id: int
     created_at: datetime
-    avatar_url: str = None
+    avatar_url: Optional[str] = None
 
     class Config:
         from_attributes = True
+
+class GroupPage(BaseModel):
+    items: List[GroupOut]
+    next_cursor: Optional[str] = None
 # RSVP Schemas
+class BulkRSVPItem(BaseModel):
+    user_id: int
+    status: Literal["yes", "no", "maybe"] = "yes"
+
+class BulkRSVPRequest(BaseModel):
+    items: List[BulkRSVPItem] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
 class RSVPResponse(BaseModel):
     id: int
     user_id: int
@@ -70,14 +97,89 @@ class EventCreate(BaseModel):
     location: str
     category: Optional[str] = None
 
+def _strip_text(value: Optional[str], max_length: int, required: bool, label: str) -> Optional[str]:
+    if value is None:
+        if required:
+            raise ValueError(f"{label} cannot be null")
+        return None
+    value = value.strip()
+    if required and not value:
+        raise ValueError(f"{label} must be a non-empty string")
+    if len(value) > max_length:
+        raise ValueError(f"{label} must be {max_length} characters or less")
+    return value or None
+
+# The `date` and `time` fields below shadow the types inside the class body
+OptionalDate = Optional[date]
+OptionalTime = Optional[time]
+
 class EventUpdate(BaseModel):
+    """
+    Partial event update. Fields are validated and normalized here, so the endpoint can
+    write model_dump(exclude_unset=True) straight into an UPDATE.
+    """
     title: Optional[str] = Field(default=None, description="Event title")
     description: Optional[str] = Field(default=None, description="Event description")
-    date: Optional[str] = Field(default=None, description="Event date (YYYY-MM-DD format)")
-    time: Optional[str] = Field(default=None, description="Event time (HH:MM:SS or ISO format)")
+    date: OptionalDate = Field(default=None, description="Event date (YYYY-MM-DD format)")
+    time: OptionalTime = Field(default=None, description="Event time (HH:MM:SS or ISO format)")
     location: Optional[str] = Field(default=None, description="Event location")
     category: Optional[str] = Field(default=None, description="Event category")
 
+    @field_validator("title")
+    @classmethod
+    def check_title(cls, value):
+        return _strip_text(value, 200, True, "Title")
+
+    @field_validator("description")
+    @classmethod
+    def check_description(cls, value):
+        return _strip_text(value, 2000, False, "Description")
+
+    @field_validator("location")
+    @classmethod
+    def check_location(cls, value):
+        return _strip_text(value, 500, True, "Location")
+
+    @field_validator("category")
+    @classmethod
+    def check_category(cls, value):
+        return _strip_text(value, 100, False, "Category")
+
+    @field_validator("date", mode="before")
+    @classmethod
+    def parse_date(cls, value):
+        if value is None:
+            raise ValueError("Date cannot be null")
+        if isinstance(value, str):
+            return datetime.strptime(value.strip(), "%Y-%m-%d").date()
+        return value
+
+    @field_validator("date")
+    @classmethod
+    def check_date(cls, value):
+        if value < datetime.now().date():
+            raise ValueError("Event date cannot be in the past")
+        return value
+
+    @field_validator("time", mode="before")
+    @classmethod
+    def parse_time(cls, value):
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError("Time cannot be empty")
+        # ISO datetimes like "2025-09-08T02:01:44.542Z" keep only their HH:MM:SS part
+        if "T" in value:
+            value = value.split("T")[1].split("Z")[0].split(".")[0]
+        try:
+            return datetime.strptime(value, "%H:%M:%S").time()
+        except ValueError:
+            raise ValueError("Invalid time format. Use HH:MM:SS or ISO format")
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not self.model_fields_set:
+            raise ValueError("No fields provided for update. At least one field must be specified.")
+        return self
+
 class EventResponse(BaseModel):
     id: int
     title: str
@@ -86,12 +188,32 @@ class EventResponse(BaseModel):
     time: time
     location: str
     category: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
 
     organizer: UserOut
     created_at: datetime
     banner_url: Optional[str] = None
+    banner_thumb_url: Optional[str] = None
+    banner_card_url: Optional[str] = None
+    banner_full_url: Optional[str] = None
+    # rsvp_count is the "yes" count; rsvp_counts has every status
     rsvp_count: int = 0
+    rsvp_counts: Dict[str, int] = {}
     rsvp_status: Optional[str] = None
 
     class Config:
         from_attributes = True
+
+class EventSearchResult(EventResponse):
+    rank: float
+    # Matching text with hits wrapped in <mark>...</mark>
+    snippet: Optional[str] = None
+
+class EventSearchPage(BaseModel):
+    items: List[EventSearchResult]
+    next_offset: Optional[int] = None
+
+class EventPage(BaseModel):
+    items: List[EventResponse]
+    next_cursor: Optional[str] = None
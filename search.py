@@ -0,0 +1,93 @@
+"""
+Ranked full-text search over events.
+
+On PostgreSQL this matches the stored events.search_vector column (GIN-indexed, see
+models.py) against websearch_to_tsquery, ranks with ts_rank_cd and highlights with
+ts_headline. Other databases get an ilike fallback with a weighted match score, so the
+endpoint works in development and tests; it scans and isn't meant for large tables.
+"""
+import html
+import re
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import and_, case, func, literal_column, or_
+from sqlalchemy.orm import Session
+
+import models
+
+# Snippets are HTML: escaped event text with matches wrapped in these markers
+HIGHLIGHT_START, HIGHLIGHT_STOP = "<mark>", "</mark>"
+# Private-use characters ts_headline marks matches with; swapped for the markers after escaping
+SENTINEL_START, SENTINEL_STOP = "\ue000", "\ue001"
+SNIPPET_CHARS = 160
+
+class SearchHit(NamedTuple):
+    event: models.Event
+    rank: float
+    snippet: Optional[str]
+
+def search_events(db: Session, q: str, limit: int, offset: int = 0) -> List[SearchHit]:
+    """Events matching `q`, best first (ties broken by id)."""
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_postgresql(db, q, limit, offset)
+    return _search_fallback(db, q, limit, offset)
+
+def _search_postgresql(db: Session, q: str, limit: int, offset: int) -> List[SearchHit]:
+    query = func.websearch_to_tsquery(models.SEARCH_CONFIG, q)
+    vector = literal_column("events.search_vector")
+    rank = func.ts_rank_cd(vector, query)
+    # Rank and page on the index first, so ts_headline only runs for the returned rows
+    page = db.query(models.Event.id.label("id"), rank.label("rank")).filter(
+        vector.op("@@")(query)
+    ).order_by(rank.desc(), models.Event.id).limit(limit).offset(offset).subquery()
+    snippet = func.ts_headline(
+        models.SEARCH_CONFIG,
+        func.concat_ws(" ", models.Event.title, models.Event.description),
+        query,
+        f"StartSel={SENTINEL_START}, StopSel={SENTINEL_STOP}, MaxWords=35, MinWords=15"
+    )
+    rows = db.query(models.Event, page.c.rank, snippet).join(
+        page, page.c.id == models.Event.id
+    ).order_by(page.c.rank.desc(), models.Event.id).all()
+    return [SearchHit(event, rank, mark_headline(snippet)) for event, rank, snippet in rows]
+
+def mark_headline(headline: Optional[str]) -> Optional[str]:
+    """HTML-escape a ts_headline result, then turn its sentinels into the highlight markers."""
+    if headline is None:
+        return None
+    return html.escape(headline).replace(SENTINEL_START, HIGHLIGHT_START).replace(SENTINEL_STOP, HIGHLIGHT_STOP)
+
+# Per-term weights of the fallback score, mirroring the tsvector's A/B/C weights
+FALLBACK_WEIGHTS = (
+    (models.Event.title, 1.0),
+    (models.Event.description, 0.4),
+    (models.Event.location, 0.2),
+    (models.Event.category, 0.2),
+)
+
+def _search_fallback(db: Session, q: str, limit: int, offset: int) -> List[SearchHit]:
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return []
+    patterns = [f"%{term}%" for term in terms]
+    rank = sum(
+        case((column.ilike(pattern), weight), else_=0.0)
+        for pattern in patterns for column, weight in FALLBACK_WEIGHTS
+    )
+    rows = db.query(models.Event, rank).filter(and_(*(
+        or_(*(column.ilike(pattern) for column, _ in FALLBACK_WEIGHTS)) for pattern in patterns
+    ))).order_by(rank.desc(), models.Event.id).limit(limit).offset(offset).all()
+    return [SearchHit(event, rank, highlight(" ".join(filter(None, [event.title, event.description])), terms)) for event, rank in rows]
+
+def highlight(text: str, terms: List[str]) -> str:
+    """Excerpt of `text` around the first match, HTML-escaped, with every match wrapped in the highlight markers."""
+    matcher = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    first = matcher.search(text)
+    start = max(0, first.start() - SNIPPET_CHARS // 2) if first else 0
+    excerpt = text[start:start + SNIPPET_CHARS]
+    pieces, end = [], 0
+    for match in matcher.finditer(excerpt):
+        pieces += [html.escape(excerpt[end:match.start()]), HIGHLIGHT_START, html.escape(match.group(0)), HIGHLIGHT_STOP]
+        end = match.end()
+    pieces.append(html.escape(excerpt[end:]))
+    return "".join(pieces)
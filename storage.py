@@ -0,0 +1,314 @@
+import hashlib
+import logging
+import os
+import re
+import shutil
+import threading
+import uuid
+from typing import NamedTuple, Optional
+
+import aiofiles
+import aiofiles.os
+from dotenv import load_dotenv
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.responses import FileResponse, PlainTextResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Largest accepted upload, enforced while the body streams in
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+# Room for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Supabase project URL; an S3 endpoint URL (".../storage/v1/s3") is accepted too
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_PROJECT_URL = re.sub(r"/storage/v1/s3/?$", "", SUPABASE_URL.rstrip("/")) if SUPABASE_URL else None
+# "local" keeps media under MEDIA_ROOT; "s3" targets any S3-compatible store (AWS, MinIO, Supabase Storage).
+# Deployments configured for Supabase keep uploading there unless STORAGE_BACKEND says otherwise.
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "s3" if SUPABASE_URL else "local").lower()
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", os.path.join(os.getcwd(), "uploads"))
+# URL prefix the local store is served under (see MediaFiles)
+MEDIA_URL = os.getenv("MEDIA_URL", "/media").rstrip("/")
+# When set (e.g. "/protected-media/"), /media responses hand the file to nginx via X-Accel-Redirect
+MEDIA_ACCEL_REDIRECT = os.getenv("MEDIA_ACCEL_REDIRECT")
+S3_BUCKET = os.getenv("S3_BUCKET", "banners")
+# Without explicit URLs, fall back to the Supabase project's S3 endpoint and public bucket URL
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL", f"{SUPABASE_PROJECT_URL}/storage/v1/s3" if SUPABASE_URL else None)
+S3_REGION = os.getenv("S3_REGION")
+S3_PUBLIC_URL = os.getenv("S3_PUBLIC_URL", f"{SUPABASE_PROJECT_URL}/storage/v1/object/public/{S3_BUCKET}" if SUPABASE_URL else None)
+# Build storage clients at startup instead of on the first upload (see warm_up)
+STORAGE_WARM_UP = os.getenv("STORAGE_WARM_UP", "false").lower() == "true"
+
+# Banner formats accepted at upload (Pillow format name -> stored extension)
+IMAGE_FORMATS = {"JPEG": ".jpg", "PNG": ".png", "GIF": ".gif", "WEBP": ".webp"}
+# The only files /media serves, with the Content-Type each is served as
+MEDIA_TYPES = {".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png", ".gif": "image/gif", ".webp": "image/webp"}
+
+def _too_large() -> HTTPException:
+    return HTTPException(status_code=413, detail="Upload too large")
+
+async def stream_to_file(upload: UploadFile, path: str, max_bytes: Optional[int] = None) -> str:
+    """
+    Copy an upload to `path` in UPLOAD_CHUNK_SIZE chunks, so memory use doesn't depend on file size.
+    Raises 413 as soon as more than `max_bytes` (default MAX_UPLOAD_BYTES) have been read;
+    nothing is left behind on failure. Returns the SHA-256 hex digest of the content.
+    """
+    max_bytes = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    await upload.seek(0)
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        async with aiofiles.open(path, "wb") as out_file:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise _too_large()
+                digest.update(chunk)
+                await out_file.write(chunk)
+    except BaseException:
+        try:
+            await aiofiles.os.remove(path)
+        except FileNotFoundError:
+            pass
+        raise
+    return digest.hexdigest()
+
+def detect_image_extension(path: str) -> Optional[str]:
+    """Stored extension for the image at `path`, from its parsed format; None unless it's a valid IMAGE_FORMATS image."""
+    # Imported here so workers that never receive an upload don't load Pillow
+    from PIL import Image
+
+    try:
+        with Image.open(path, formats=list(IMAGE_FORMATS)) as image:
+            image.verify()
+            return IMAGE_FORMATS.get(image.format)
+    except Exception:
+        return None
+
+class StagedUpload(NamedTuple):
+    path: str
+    key: str
+    content_type: str
+
+async def stage_upload(upload: UploadFile) -> StagedUpload:
+    """
+    Stream an upload into MEDIA_ROOT/.staging and derive its content-addressed key: the
+    SHA-256 of the bytes plus the extension of the detected image format. The client's
+    filename and Content-Type are ignored. Anything but a JPEG, PNG, GIF or WebP image is
+    rejected with 400 and removed. The caller removes `path` when done.
+    """
+    staging_dir = os.path.join(MEDIA_ROOT, ".staging")
+    await aiofiles.os.makedirs(staging_dir, exist_ok=True)
+    path = os.path.join(staging_dir, uuid.uuid4().hex)
+    digest = await stream_to_file(upload, path)
+    ext = await run_in_threadpool(detect_image_extension, path)
+    if ext is None:
+        await aiofiles.os.remove(path)
+        raise HTTPException(status_code=400, detail="Banner must be a JPEG, PNG, GIF or WebP image")
+    return StagedUpload(path=path, key=f"{digest}{ext}", content_type=MEDIA_TYPES[ext])
+
+class LocalStorage:
+    """
+    Content-addressed store on the local filesystem. Keys are content hashes, so an
+    identical upload lands on the existing file instead of writing a new copy.
+    """
+
+    def __init__(self, root: str, base_url: str = MEDIA_URL):
+        self.root = root
+        self.base_url = base_url
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def url_for(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    def key_for(self, url: str) -> Optional[str]:
+        if url.startswith(self.base_url + "/"):
+            return url[len(self.base_url) + 1:]
+        return None
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path_for(key))
+
+    def put(self, source_path: str, key: str, content_type: Optional[str] = None) -> str:
+        """Store a copy of `source_path` under `key`; a hard link when possible, nothing if already stored."""
+        target = self.path_for(key)
+        if not os.path.exists(target):
+            os.makedirs(self.root, exist_ok=True)
+            try:
+                os.link(source_path, target)
+            except FileExistsError:
+                pass
+            except OSError:
+                tmp_target = f"{target}.{uuid.uuid4().hex}.tmp"
+                shutil.copyfile(source_path, tmp_target)
+                os.replace(tmp_target, target)
+        return self.url_for(key)
+
+    def delete(self, key: str):
+        try:
+            os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+    def warm_up(self):
+        os.makedirs(self.root, exist_ok=True)
+
+class S3Storage:
+    """
+    Store on an S3-compatible bucket; uploads stream from disk via multipart transfers.
+    The boto3 client is built on first use: importing boto3 and loading the S3 service
+    model would otherwise add to every worker's startup.
+    """
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None, public_url: Optional[str] = None,
+                 region: Optional[str] = None, session=None):
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.public_url = (public_url or f"{endpoint_url or 'https://s3.amazonaws.com'}/{bucket}").rstrip("/")
+        self._session = session
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            # boto3 sessions aren't thread-safe, so only one thread builds the client
+            with self._client_lock:
+                if self._client is None:
+                    session = self._session
+                    if session is None:
+                        import boto3
+
+                        session = boto3.session.Session(
+                            aws_access_key_id=os.getenv("aws_access_key_id"),
+                            aws_secret_access_key=os.getenv("aws_secret_access_key"),
+                        )
+                    self._client = session.client("s3", endpoint_url=self.endpoint_url, region_name=self.region)
+        return self._client
+
+    def warm_up(self):
+        self.client
+
+    def url_for(self, key: str) -> str:
+        return f"{self.public_url}/{key}"
+
+    def key_for(self, url: str) -> Optional[str]:
+        prefix = self.public_url + "/"
+        return url[len(prefix):] if url.startswith(prefix) else None
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def put(self, source_path: str, key: str, content_type: Optional[str] = None) -> str:
+        if not self.exists(key):
+            extra_args = {"ContentType": content_type} if content_type else None
+            self.client.upload_file(source_path, self.bucket, key, ExtraArgs=extra_args)
+        return self.url_for(key)
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+def create_storage():
+    if STORAGE_BACKEND == "s3":
+        if os.getenv("SUPABASE_SERVICE_KEY") and not os.getenv("aws_access_key_id"):
+            # The S3 protocol needs S3 access keys; the service key of the old Supabase client doesn't work
+            logger.warning("SUPABASE_SERVICE_KEY is no longer used; set aws_access_key_id and aws_secret_access_key "
+                           "to S3 access keys from the Supabase Storage settings")
+        return S3Storage(S3_BUCKET, endpoint_url=S3_ENDPOINT_URL, public_url=S3_PUBLIC_URL, region=S3_REGION)
+    return LocalStorage(MEDIA_ROOT)
+
+media_storage = create_storage()
+
+def warm_up():
+    """Build the media storage client now; main.py calls this at startup when STORAGE_WARM_UP is set."""
+    media_storage.warm_up()
+
+# <sha256>.<ext> originals and their <sha256>_<variant>.webp renditions
+CONTENT_HASHED_NAME = re.compile(r"^(?P<digest>[0-9a-f]{64}(?:_[a-z]+)?)\.[0-9a-z]+$")
+
+class MediaFiles(StaticFiles):
+    """
+    Serves the local store. Content-hashed names never change content, so they get a strong
+    ETag derived from the name and a year-long immutable Cache-Control; other files fall back
+    to Starlette's stat-based ETag with revalidation. FileResponse handles Range requests and
+    uses the ASGI pathsend extension where the server supports it. With MEDIA_ACCEL_REDIRECT
+    the body is left to nginx, which sends the file with sendfile().
+    Only MEDIA_TYPES image files are served, with their own Content-Type and nosniff, so
+    nothing under MEDIA_ROOT can be served as HTML or script from the API's origin.
+    """
+
+    async def get_response(self, path: str, scope) -> Response:
+        # Hide in-progress uploads under .staging and any other dotfiles
+        if any(part.startswith(".") for part in path.split("/")):
+            raise StarletteHTTPException(status_code=404)
+        if os.path.splitext(path)[1].lower() not in MEDIA_TYPES:
+            raise StarletteHTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        name = os.path.basename(full_path)
+        match = CONTENT_HASHED_NAME.match(name)
+        if match:
+            headers = {"ETag": f'"{match.group("digest")}"', "Cache-Control": "public, max-age=31536000, immutable"}
+        else:
+            headers = {"Cache-Control": "no-cache"}
+        headers["X-Content-Type-Options"] = "nosniff"
+        if MEDIA_ACCEL_REDIRECT:
+            headers["X-Accel-Redirect"] = MEDIA_ACCEL_REDIRECT + os.path.relpath(full_path, self.directory)
+            return Response(status_code=status_code, headers=headers)
+        media_type = MEDIA_TYPES[os.path.splitext(full_path)[1].lower()]
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers, media_type=media_type)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject oversized upload requests while they are received, before the multipart
+    parser spools them: up front from Content-Length, or mid-stream for chunked bodies.
+    """
+
+    def __init__(self, app, path_pattern: str, max_bytes: Optional[int] = None):
+        self.app = app
+        self.path_pattern = re.compile(path_pattern)
+        self.max_bytes = MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES if max_bytes is None else max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.path_pattern.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            response = PlainTextResponse(_too_large().detail, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise _too_large()
+            return message
+
+        await self.app(scope, limited_receive, send)
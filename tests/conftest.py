@@ -0,0 +1,105 @@
+import os
+import sys
+from contextlib import contextmanager
+from datetime import date, time
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "1")
+os.environ.setdefault("STORAGE_BACKEND", "local")
+
+from fastapi.testclient import TestClient
+
+import auth
+import cache
+import database
+import models
+from database import get_db
+from main import app
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    models.Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine, monkeypatch):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # Background tasks open their own sessions
+    monkeypatch.setattr(database, "SessionLocal", TestingSessionLocal)
+    session = TestingSessionLocal()
+
+    def override_get_db():
+        yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    auth.user_cache.clear()
+    cache.response_cache.backend = cache.InMemoryBackend(maxsize=cache.RESPONSE_CACHE_SIZE, ttl=cache.RESPONSE_CACHE_TTL)
+    yield session
+    app.dependency_overrides.clear()
+    session.close()
+
+
+@pytest.fixture
+def client(db):
+    return TestClient(app)
+
+
+@pytest.fixture
+def count_queries(engine):
+    """Count the SELECT/INSERT/UPDATE/DELETE statements run inside a `with` block."""
+    @contextmanager
+    def counter():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counter
+
+
+def make_user(db, name="User", email=None):
+    user = models.User(
+        name=name,
+        email=email or f"{name.lower().replace(' ', '.')}@example.com",
+        password_hash="not-a-real-hash",
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def make_event(db, organizer, **overrides):
+    fields = dict(title="Launch", date=date(2030, 1, 1), time=time(18, 0), location="Oslo", organizer_id=organizer.id)
+    fields.update(overrides)
+    event = models.Event(**fields)
+    db.add(event)
+    db.commit()
+    db.refresh(event)
+    return event
+
+
+def auth_headers(user):
+    token = auth.create_access_token(data={"sub": user.email})
+    return {"Authorization": f"Bearer {token}"}
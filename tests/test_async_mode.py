@@ -0,0 +1,71 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+import models
+from conftest import auth_headers, make_event, make_user
+from database import async_database_url, get_async_db
+from routers import events, groups
+from routers.async_routes import make_async_router
+
+
+@pytest.fixture
+def async_client(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine = create_engine(url)
+    models.Base.metadata.create_all(bind=engine)
+    async_engine = create_async_engine(async_database_url(url), poolclass=NullPool)
+    AsyncTestingSession = async_sessionmaker(async_engine, autoflush=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSession() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(make_async_router(events.router))
+    app.include_router(make_async_router(groups.router))
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client, sessionmaker(bind=engine)()
+    engine.dispose()
+
+
+def test_async_url_swaps_drivers():
+    url = async_database_url("postgresql://u:p@db.example.com:5432/app?sslmode=require")
+    assert url.drivername == "postgresql+asyncpg"
+    assert url.query == {"ssl": "require"}
+    assert async_database_url("sqlite:///tv.db").drivername == "sqlite+aiosqlite"
+
+
+def test_async_routes_serve_events_and_auth(async_client):
+    client, db = async_client
+    organizer = make_user(db, "Organizer")
+    make_event(db, organizer)
+    headers = auth_headers(organizer)
+
+    listing = client.get("/events/").json()
+    assert [e["title"] for e in listing["items"]] == ["Launch"]
+    event_id = listing["items"][0]["id"]
+
+    assert client.post(f"/events/{event_id}/rsvp", headers=headers).status_code == 200
+    event = client.get(f"/events/{event_id}", headers=headers).json()
+    assert event["organizer"]["name"] == "Organizer"
+    assert (event["rsvp_count"], event["rsvp_status"]) == (1, "yes")
+    assert client.get(f"/events/{event_id}").status_code == 401
+
+    updated = client.put(f"/events/{event_id}", json={"title": "Relaunch"}, headers=headers).json()
+    assert (updated["title"], updated["rsvp_status"]) == ("Relaunch", "yes")
+
+
+def test_async_routes_serialize_expired_orm_objects(async_client):
+    client, db = async_client
+    owner = make_user(db, "Owner")
+
+    response = client.post("/groups/", json={"name": "Hikers"}, headers=auth_headers(owner))
+
+    assert response.status_code == 200
+    assert response.json()["owner_id"] == owner.id
@@ -0,0 +1,85 @@
+import asyncio
+
+import bcrypt
+
+import auth
+import models
+
+
+def test_register_and_login_hash_on_the_process_pool(client, db):
+    response = client.post("/register", json={"name": "Ada", "email": "ada@example.com", "password": "s3cret"})
+    assert response.status_code == 200
+
+    user = db.query(models.User).filter_by(email="ada@example.com").one()
+    assert not auth.password_needs_rehash(user.password_hash)
+
+    response = client.post("/login", data={"username": "ada@example.com", "password": "s3cret"})
+    assert response.status_code == 200
+    assert client.post("/login", data={"username": "ada@example.com", "password": "nope"}).status_code == 401
+
+
+def test_password_pool_restarts_after_shutdown():
+    asyncio.run(auth.get_password_hash_async("s3cret"))
+    auth.shutdown_password_pool()
+
+    hashed = asyncio.run(auth.get_password_hash_async("s3cret"))
+
+    assert auth.verify_password("s3cret", hashed)
+    auth.shutdown_password_pool()
+
+
+def test_login_rehashes_when_cost_factor_changes(client, db):
+    old_hash = bcrypt.hashpw(b"s3cret", bcrypt.gensalt(rounds=auth.BCRYPT_ROUNDS + 1)).decode()
+    db.add(models.User(name="Ada", email="ada@example.com", password_hash=old_hash))
+    db.commit()
+    assert auth.password_needs_rehash(old_hash)
+
+    response = client.post("/login", data={"username": "ada@example.com", "password": "s3cret"})
+
+    assert response.status_code == 200
+    user = db.query(models.User).filter_by(email="ada@example.com").one()
+    db.refresh(user)
+    assert user.password_hash != old_hash
+    assert not auth.password_needs_rehash(user.password_hash)
+    assert auth.verify_password("s3cret", user.password_hash)
+
+
+def test_authenticated_requests_reuse_cached_user(client, db, count_queries):
+    user = models.User(name="Ada", email="ada@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+    headers = {"Authorization": f"Bearer {auth.create_access_token(data={'sub': 'ada@example.com'})}"}
+    db.expunge_all()
+
+    client.get("/me", headers=headers)
+    with count_queries() as statements:
+        response = client.get("/me", headers=headers)
+
+    assert response.json()["name"] == "Ada"
+    assert statements == []
+    assert client.get("/metrics/auth-cache").json()["hits"] >= 1
+
+
+def test_cached_user_is_invalidated_on_update(client, db):
+    db.add(models.User(name="Ada", email="ada@example.com", password_hash="x"))
+    db.commit()
+    headers = {"Authorization": f"Bearer {auth.create_access_token(data={'sub': 'ada@example.com'})}"}
+    client.get("/me", headers=headers)
+
+    user = db.query(models.User).filter_by(email="ada@example.com").one()
+    user.name = "Ada Lovelace"
+    db.commit()
+
+    assert client.get("/me", headers=headers).json()["name"] == "Ada Lovelace"
+
+
+def test_register_relies_on_the_unique_email_index(client, db, count_queries):
+    payload = {"name": "Ada", "email": "ada@example.com", "password": "s3cret"}
+
+    with count_queries() as statements:
+        assert client.post("/register", json=payload).status_code == 200
+    duplicate = client.post("/register", json=payload)
+
+    assert len(statements) == 1 and "ON CONFLICT" in statements[0]
+    assert duplicate.status_code == 400
+    assert db.query(models.User).count() == 1
@@ -0,0 +1,71 @@
+import models
+from conftest import auth_headers, make_event, make_user
+
+
+def test_bulk_rsvp_writes_one_statement_with_per_item_results(client, db, count_queries):
+    organizer = make_user(db, "Organizer")
+    guests = [make_user(db, f"Guest {i}") for i in range(3)]
+    event_id = make_event(db, organizer).id
+    db.add(models.RSVP(user_id=guests[0].id, event_id=event_id, status="no"))
+    db.commit()
+    headers = auth_headers(organizer)
+    client.get("/me", headers=headers)
+    items = [
+        {"user_id": guests[0].id, "status": "yes"},
+        {"user_id": guests[1].id, "status": "maybe"},
+        {"user_id": 999},
+        {"user_id": guests[2].id},
+        {"user_id": guests[2].id, "status": "no"},
+    ]
+
+    with count_queries() as statements:
+        response = client.post(f"/events/{event_id}/rsvps/bulk", json={"items": items}, headers=headers)
+
+    results = response.json()["results"]
+    assert [r["ok"] for r in results] == [True, True, False, True, False]
+    assert [r["error"] for r in results if not r["ok"]] == ["User not found", "Duplicate item"]
+    assert len([s for s in statements if s.startswith("INSERT")]) == 1
+    assert len(statements) == 3
+    event = db.get(models.Event, event_id)
+    db.refresh(event)
+    assert (event.rsvp_yes_count, event.rsvp_no_count, event.rsvp_maybe_count) == (2, 0, 1)
+
+
+def test_bulk_rsvp_is_limited_to_the_organizer(client, db):
+    organizer = make_user(db, "Organizer")
+    other = make_user(db, "Other")
+    event_id = make_event(db, organizer).id
+
+    response = client.post(f"/events/{event_id}/rsvps/bulk", json={"items": [{"user_id": other.id}]}, headers=auth_headers(other))
+
+    assert response.status_code == 403
+
+
+def test_bulk_rsvp_rejects_oversized_batches(client, db):
+    organizer = make_user(db, "Organizer")
+    event_id = make_event(db, organizer).id
+
+    response = client.post(f"/events/{event_id}/rsvps/bulk", json={"items": [{"user_id": 1}] * 1001}, headers=auth_headers(organizer))
+
+    assert response.status_code == 422
+
+
+def test_bulk_join_reports_existing_members(client, db):
+    owner = make_user(db, "Owner")
+    headers = auth_headers(owner)
+    group_id = client.post("/groups/", json={"name": "Team"}, headers=headers).json()["id"]
+    newcomers = [make_user(db, f"Newcomer {i}") for i in range(2)]
+    assert client.get(f"/groups/{group_id}/members").status_code == 200
+
+    response = client.post(
+        f"/groups/{group_id}/members/bulk",
+        json={"user_ids": [owner.id, newcomers[0].id, newcomers[1].id, 999]},
+        headers=headers,
+    )
+
+    results = response.json()["results"]
+    assert [(r["ok"], r["error"]) for r in results] == [
+        (False, "Already a member"), (True, None), (True, None), (False, "User not found")
+    ]
+    members = client.get(f"/groups/{group_id}/members").json()
+    assert {m["id"] for m in members} == {owner.id, newcomers[0].id, newcomers[1].id}
@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+import database
+
+
+def test_engine_options_configure_pool_for_postgres():
+    options = database.engine_options("postgresql://u:p@localhost/app")
+    assert options["poolclass"] is database.InstrumentedQueuePool
+    assert options["pool_size"] == database.DB_POOL_SIZE
+    assert options["pool_pre_ping"] is database.DB_POOL_PRE_PING
+    assert database.engine_options("sqlite://") == {}
+
+
+def test_instrumented_pool_records_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=database.InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    before = (database.pool_metrics.checkouts, database.pool_metrics.timeouts)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    assert database.pool_metrics.checkouts == before[0] + 1
+    assert database.pool_metrics.timeouts == before[1] + 1
+    assert database.pool_metrics.wait_seconds_max >= 0.05
+    engine.dispose()
+
+
+def test_pool_metrics_endpoint(client):
+    body = client.get("/metrics/db-pool").json()
+    assert {"pool_class", "checkouts", "checkout_timeouts", "wait_seconds_total"} <= body.keys()
@@ -0,0 +1,131 @@
+from datetime import date, time
+
+import models
+from cache import response_cache
+from conftest import auth_headers, make_user
+from routers.events import EVENTS_CACHE_TAG
+
+
+def seed_events(db, organizer, count):
+    events = [
+        models.Event(
+            title=f"Event {i}",
+            date=date(2030, 1, 1 + i % 28),
+            time=time(18, 0),
+            location="Berlin",
+            category="Music",
+            organizer_id=organizer.id,
+        )
+        for i in range(count)
+    ]
+    db.add_all(events)
+    db.commit()
+    return events
+
+
+def test_rsvp_info_counts_yes_and_viewer_status(client, db):
+    organizer = make_user(db, "Organizer")
+    guest = make_user(db, "Guest")
+    first, second = seed_events(db, organizer, 2)
+    db.add_all([
+        models.RSVP(user_id=organizer.id, event_id=first.id, status="yes"),
+        models.RSVP(user_id=guest.id, event_id=first.id, status="yes"),
+        models.RSVP(user_id=guest.id, event_id=second.id, status="maybe"),
+    ])
+    db.commit()
+
+    response = client.get("/events/organizers/me/events", headers=auth_headers(organizer))
+
+    assert response.status_code == 200
+    by_id = {e["id"]: e for e in response.json()}
+    assert by_id[first.id]["rsvp_count"] == 2
+    assert by_id[first.id]["rsvp_status"] == "yes"
+    assert by_id[second.id]["rsvp_count"] == 0
+    assert by_id[second.id]["rsvp_status"] is None
+
+
+def test_list_events_returns_real_rsvp_counts(client, db):
+    organizer = make_user(db, "Organizer")
+    (event,) = seed_events(db, organizer, 1)
+    db.add(models.RSVP(user_id=organizer.id, event_id=event.id, status="yes"))
+    db.commit()
+
+    response = client.get("/events/")
+
+    assert response.json()["items"][0]["rsvp_count"] == 1
+
+
+def test_my_events_query_count_does_not_grow_with_events(client, db, count_queries):
+    organizer = make_user(db, "Organizer")
+    headers = auth_headers(organizer)
+    client.get("/me", headers=headers)
+
+    seed_events(db, organizer, 2)
+    with count_queries() as few:
+        client.get("/events/organizers/me/events", headers=headers)
+
+    seed_events(db, organizer, 50)
+    with count_queries() as many:
+        response = client.get("/events/organizers/me/events", headers=headers)
+
+    assert len(response.json()) == 52
+    assert len(many) == len(few)
+
+
+def test_event_rsvps_buckets_users_in_one_query(client, db, count_queries):
+    organizer = make_user(db, "Organizer")
+    (event,) = seed_events(db, organizer, 1)
+    guests = [make_user(db, f"Guest {i}") for i in range(6)]
+    statuses = ["yes", "yes", "yes", "no", "maybe", "maybe"]
+    db.add_all([
+        models.RSVP(user_id=guest.id, event_id=event.id, status=status)
+        for guest, status in zip(guests, statuses)
+    ])
+    db.commit()
+    url = f"/events/{event.id}/rsvps"
+
+    with count_queries() as statements:
+        response = client.get(url)
+
+    body = response.json()
+    assert [u["id"] for u in body["yes"]] == [g.id for g in guests[:3]]
+    assert [u["id"] for u in body["no"]] == [guests[3].id]
+    assert len(body["maybe"]) == 2
+    assert len(statements) == 1
+
+
+def test_event_rsvps_pages_per_status(client, db):
+    organizer = make_user(db, "Organizer")
+    (event,) = seed_events(db, organizer, 1)
+    guests = [make_user(db, f"Guest {i}") for i in range(5)]
+    db.add_all([models.RSVP(user_id=g.id, event_id=event.id, status="yes") for g in guests])
+    db.add(models.RSVP(user_id=organizer.id, event_id=event.id, status="maybe"))
+    db.commit()
+
+    response = client.get(f"/events/{event.id}/rsvps", params={"limit": 2, "offset": 2})
+    body = response.json()
+    assert [u["id"] for u in body["yes"]] == [g.id for g in guests[2:4]]
+    assert body["maybe"] == []
+
+    response = client.get(f"/events/{event.id}/rsvps", params={"status": "maybe"})
+    body = response.json()
+    assert body["yes"] == []
+    assert [u["id"] for u in body["maybe"]] == [organizer.id]
+
+
+def test_list_events_loads_organizers_without_extra_queries(client, db, count_queries):
+    for i in range(2):
+        seed_events(db, make_user(db, f"Organizer {i}"), 1)
+    db.expunge_all()
+    with count_queries() as few:
+        client.get("/events/")
+
+    for i in range(2, 30):
+        seed_events(db, make_user(db, f"Organizer {i}"), 1)
+    response_cache.invalidate(EVENTS_CACHE_TAG)
+    db.expunge_all()
+    with count_queries() as many:
+        response = client.get("/events/")
+
+    assert len({e["organizer"]["id"] for e in response.json()["items"]}) == 30
+    assert len(many) == len(few)
@@ -0,0 +1,41 @@
+import models
+from conftest import auth_headers, make_event, make_user
+
+
+def test_update_is_a_single_statement(client, db, count_queries):
+    organizer = make_user(db, "Organizer")
+    event_id = make_event(db, organizer, description="Old").id
+    db.add(models.RSVP(user_id=organizer.id, event_id=event_id, status="maybe"))
+    db.commit()
+    headers = auth_headers(organizer)
+    client.get("/me", headers=headers)
+
+    with count_queries() as statements:
+        response = client.put(f"/events/{event_id}", json={"title": "  Relaunch ", "time": "2030-01-01T20:30:00.000Z", "description": None}, headers=headers)
+
+    body = response.json()
+    assert response.status_code == 200
+    assert (body["title"], body["time"], body["description"]) == ("Relaunch", "20:30:00", None)
+    assert (body["organizer"]["id"], body["rsvp_status"], body["rsvp_counts"]["maybe"]) == (organizer.id, "maybe", 1)
+    assert len(statements) == 1 and statements[0].startswith("UPDATE events")
+
+
+def test_update_checks_ownership_and_existence(client, db):
+    organizer = make_user(db, "Organizer")
+    event_id = make_event(db, organizer, description="Old").id
+    other = auth_headers(make_user(db, "Other"))
+
+    assert client.put(f"/events/{event_id}", json={"title": "Mine"}, headers=other).status_code == 403
+    assert client.put("/events/999", json={"title": "Mine"}, headers=other).status_code == 404
+    event = db.get(models.Event, event_id)
+    db.refresh(event)
+    assert event.title == "Launch"
+
+
+def test_update_validation_happens_in_the_schema(client, db):
+    organizer = make_user(db, "Organizer")
+    event_id = make_event(db, organizer, description="Old").id
+    headers = auth_headers(organizer)
+
+    for payload in ({}, {"title": " "}, {"date": "2000-01-01"}, {"time": "25:00:00"}, {"location": None}, {"category": "x" * 101}):
+        assert client.put(f"/events/{event_id}", json=payload, headers=headers).status_code == 422, payload
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import select
+
+import geo
+import models
+from conftest import auth_headers, make_event, make_user
+from test_indexes import explain_sqlite
+
+
+@pytest.mark.parametrize("location, expected", [
+    ("Tech Hub, 123 Main St, San Francisco, CA", (37.7749, -122.4194)),
+    ("Paris", (48.8566, 2.3522)),
+    ("Lamar County Fair, Paris, TX", (33.6609, -95.5555)),
+    ("Rooftop bar in Zürich", (47.3769, 8.5417)),
+    ("Somewhere secret", None),
+    ("Oslo, Norway", (59.9139, 10.7522)),
+    ("Paris, Las Vegas, NV", (36.1699, -115.1398)),
+    ("Perth, WA, Australia", (-31.9505, 115.8605)),
+    # A city name inside a street or venue name, or a city the gazetteer doesn't have
+    ("Washington Square Park, NYC", None),
+    ("Washington Square Park", None),
+    ("London Road, Brighton", None),
+    ("London, Ontario", None),
+])
+def test_geocode_against_the_gazetteer(location, expected):
+    assert geo.geocode(location) == expected
+
+
+def test_geohash_encode_and_covering_cells():
+    assert geo.geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    cells = geo.covering_cells(59.9139, 10.7522, 10)
+    assert len(cells) == 9 and geo.geohash_encode(59.9139, 10.7522, len(cells[0])) in cells
+
+
+def test_create_and_update_geocode_the_location(client, db):
+    headers = auth_headers(make_user(db, "Organizer"))
+    body = {"title": "Launch", "date": "2030-01-01", "time": "18:00:00", "location": "Studio 5, Oakland, CA"}
+    created = client.post("/events/", json=body, headers=headers).json()
+    assert (created["latitude"], created["longitude"]) == (37.8044, -122.2712)
+
+    updated = client.put(f"/events/{created['id']}", json={"location": "Unknown venue"}, headers=headers).json()
+    assert (updated["latitude"], updated["longitude"]) == (None, None)
+
+
+def test_near_filters_by_distance(client, db):
+    organizer = make_user(db, "Organizer")
+    san_francisco, oakland, _, _ = [
+        make_event(db, organizer, location=location, **geo.coordinates_for(location)).id
+        for location in ("Mission, San Francisco, CA", "Oakland, CA", "San Jose, CA", "Secret location")
+    ]
+
+    def near(**params):
+        return [item["id"] for item in client.get("/events/", params={"near": "37.7749,-122.4194", **params}).json()["items"]]
+
+    assert near() == [san_francisco]
+    assert near(radius_km=20) == [san_francisco, oakland]
+    assert client.get("/events/", params={"near": "north"}).status_code == 400
+    assert client.get("/events/", params={"near": "1,2", "radius_km": 0}).status_code == 422
+
+
+def test_near_uses_geohash_index(engine, db):
+    stmt = select(models.Event.id).where(geo.near_clause(db, 37.7749, -122.4194, 10))
+    assert "ix_events_geohash" in explain_sqlite(engine, stmt)
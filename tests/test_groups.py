@@ -0,0 +1,27 @@
+import models
+from conftest import auth_headers, make_user
+
+
+def test_create_group_adds_owner_membership_in_one_transaction(client, db, count_queries):
+    owner = make_user(db, "Owner")
+    headers = auth_headers(owner)
+    client.get("/me", headers=headers)
+
+    with count_queries() as statements:
+        response = client.post("/groups/", json={"name": "Hikers", "description": "Trails"}, headers=headers)
+
+    group = response.json()
+    assert (group["name"], group["description"], group["owner_id"]) == ("Hikers", "Trails", owner.id)
+    assert [s.split()[:3] for s in statements] == [["INSERT", "INTO", "groups"], ["INSERT", "INTO", "group_members"]]
+    assert db.query(models.GroupMember).filter_by(group_id=group["id"], user_id=owner.id).count() == 1
+
+
+def test_duplicate_group_name_is_rejected_without_side_effects(client, db):
+    headers = auth_headers(make_user(db, "Owner"))
+    client.post("/groups/", json={"name": "Hikers"}, headers=headers)
+
+    response = client.post("/groups/", json={"name": "Hikers"}, headers=headers)
+
+    assert response.status_code == 400
+    assert db.query(models.Group).count() == 1
+    assert db.query(models.GroupMember).count() == 1
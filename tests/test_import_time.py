@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+# Generous against the ~0.8s measured locally; the module check below is the strict part
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "2500"))
+# Only needed once media is actually stored or rendered
+LAZY_MODULES = ("boto3", "botocore", "PIL", "redis")
+
+
+def import_times(module: str, **env) -> dict:
+    """Cumulative import time in microseconds per module, from `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=dict(os.environ, **env), capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_app_import_skips_storage_clients_and_stays_within_budget():
+    times = import_times("main", STORAGE_BACKEND="s3", STORAGE_WARM_UP="false", DATABASE_URL="sqlite://")
+
+    assert not [name for name in times if name.split(".")[0] in LAZY_MODULES]
+    assert times["main"] / 1000 < IMPORT_TIME_BUDGET_MS
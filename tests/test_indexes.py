@@ -0,0 +1,68 @@
+import os
+from datetime import date, time
+
+import pytest
+from sqlalchemy import create_engine, select, text
+
+import models
+
+
+def explain_sqlite(engine, stmt):
+    compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        return " ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+
+
+def test_rsvp_aggregation_uses_event_status_index(engine):
+    stmt = select(models.RSVP.id).where(models.RSVP.event_id == 1, models.RSVP.status == "yes")
+    assert "ix_rsvps_event_id_status" in explain_sqlite(engine, stmt)
+
+
+def test_organizer_events_use_organizer_date_index(engine):
+    stmt = select(models.Event.id).where(models.Event.organizer_id == 1).order_by(models.Event.date)
+    plan = explain_sqlite(engine, stmt)
+    assert "ix_events_organizer_id_date" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_event_listing_order_uses_date_time_index(engine):
+    stmt = select(models.Event.id).order_by(models.Event.date, models.Event.time, models.Event.id).limit(20)
+    plan = explain_sqlite(engine, stmt)
+    assert "ix_events_date_time_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_start_time_filter_uses_time_index(engine):
+    stmt = select(models.Event.id).where(models.Event.time >= time(18, 0))
+    assert "ix_events_time" in explain_sqlite(engine, stmt)
+
+
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL (PostgreSQL) not set")
+@pytest.mark.parametrize("column,index", [
+    ("location", "ix_events_location_trgm"),
+    ("category", "ix_events_category_trgm"),
+])
+def test_substring_filters_use_trigram_indexes(column, index):
+    engine = create_engine(os.environ["TEST_DATABASE_URL"])
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    models.Base.metadata.create_all(bind=engine)
+    try:
+        with engine.begin() as conn:
+            user_id = conn.execute(
+                models.User.__table__.insert().values(name="Organizer", email="organizer@example.com", password_hash="x")
+            ).inserted_primary_key[0]
+            conn.execute(models.Event.__table__.insert(), [
+                {"title": f"Event {i}", "date": date(2030, 1, 1), "time": "18:00:00",
+                 "location": f"City {i}", "category": f"Category {i}", "organizer_id": user_id}
+                for i in range(200)
+            ])
+            conn.execute(text("ANALYZE events"))
+            conn.execute(text("SET LOCAL enable_seqscan = off"))
+            plan = "\n".join(row[0] for row in conn.execute(
+                text(f"EXPLAIN SELECT id FROM events WHERE {column} ILIKE '%ity 1%'")
+            ))
+        assert index in plan
+    finally:
+        models.Base.metadata.drop_all(bind=engine)
+        engine.dispose()
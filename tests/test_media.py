@@ -0,0 +1,76 @@
+import hashlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import storage
+from main import app as main_app
+
+CONTENT = bytes(range(256)) * 40
+DIGEST = hashlib.sha256(CONTENT).hexdigest()
+
+
+@pytest.fixture
+def media_client(tmp_path):
+    (tmp_path / f"{DIGEST}.jpg").write_bytes(CONTENT)
+    (tmp_path / f"{DIGEST}_thumb.webp").write_bytes(b"webp")
+    (tmp_path / "event_1_1700000000.jpg").write_bytes(b"legacy")
+    (tmp_path / f"{DIGEST}.html").write_bytes(b"<script>alert(1)</script>")
+    (tmp_path / f"{DIGEST}.svg").write_bytes(b'<svg xmlns="http://www.w3.org/2000/svg" onload="alert(1)"/>')
+    (tmp_path / ".staging").mkdir()
+    (tmp_path / ".staging" / "partial").write_bytes(b"partial")
+    app = FastAPI()
+    app.mount("/media", storage.MediaFiles(directory=str(tmp_path)), name="media")
+    return TestClient(app)
+
+
+def test_media_is_mounted_for_the_local_backend():
+    assert any(getattr(route, "path", None) == storage.MEDIA_URL for route in main_app.routes)
+    assert storage.media_storage.url_for("abc.jpg") == f"{storage.MEDIA_URL}/abc.jpg"
+
+
+def test_hashed_names_are_immutable_with_a_strong_etag(media_client):
+    response = media_client.get(f"/media/{DIGEST}.jpg")
+
+    assert response.status_code == 200 and response.content == CONTENT
+    assert response.headers["etag"] == f'"{DIGEST}"'
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert response.headers["content-type"] == "image/jpeg"
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert media_client.get(f"/media/{DIGEST}_thumb.webp").headers["etag"] == f'"{DIGEST}_thumb"'
+
+    revalidated = media_client.get(f"/media/{DIGEST}.jpg", headers={"If-None-Match": f'"{DIGEST}"'})
+    assert revalidated.status_code == 304
+
+
+def test_range_requests_return_partial_content(media_client):
+    response = media_client.get(f"/media/{DIGEST}.jpg", headers={"Range": "bytes=100-199"})
+
+    assert response.status_code == 206
+    assert response.content == CONTENT[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+
+    stale = media_client.get(f"/media/{DIGEST}.jpg", headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+    assert stale.status_code == 200 and stale.content == CONTENT
+
+
+def test_other_names_revalidate_and_staging_is_hidden(media_client):
+    legacy = media_client.get("/media/event_1_1700000000.jpg")
+    assert legacy.headers["cache-control"] == "no-cache"
+    assert media_client.get("/media/.staging/partial").status_code == 404
+
+
+def test_accel_redirect_leaves_the_body_to_the_proxy(media_client, monkeypatch):
+    monkeypatch.setattr(storage, "MEDIA_ACCEL_REDIRECT", "/protected-media/")
+
+    response = media_client.get(f"/media/{DIGEST}.jpg")
+
+    assert response.headers["x-accel-redirect"] == f"/protected-media/{DIGEST}.jpg"
+    assert response.headers["etag"] == f'"{DIGEST}"'
+    assert response.content == b""
+
+
+@pytest.mark.parametrize("name", [f"{DIGEST}.html", f"{DIGEST}.svg"])
+def test_only_image_types_are_served(media_client, name):
+    assert media_client.get(f"/media/{name}").status_code == 404
@@ -0,0 +1,49 @@
+import metrics
+from conftest import auth_headers, make_event, make_user
+
+
+def sample(body: str, series: str) -> float:
+    for line in body.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_metrics_record_route_latency_status_and_sql(client, db, engine):
+    metrics.instrument_engine(engine)
+    organizer = make_user(db, "Organizer")
+    event_id = make_event(db, organizer).id
+    headers = auth_headers(organizer)
+    route = 'method="GET",route="/events/{event_id}"'
+    before = metrics.render()
+
+    assert client.get(f"/events/{event_id}", headers=headers).status_code == 200
+    assert client.get("/events/999999", headers=headers).status_code == 404
+    response = client.get("/metrics")
+
+    body = response.text
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    for status in ("200", "404"):
+        series = f'http_responses_total{{{route},status="{status}"}}'
+        assert sample(body, series) == sample(before, series) + 1
+    assert sample(body, f"http_request_duration_seconds_count{{{route}}}") == sample(before, f"http_request_duration_seconds_count{{{route}}}") + 2
+    assert sample(body, f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}') == sample(body, f"http_request_duration_seconds_count{{{route}}}")
+    # The 200 loads the event and the viewer's RSVP status, the 404 only the event
+    assert sample(body, f"http_request_sql_queries_sum{{{route}}}") >= sample(before, f"http_request_sql_queries_sum{{{route}}}") + 3
+    assert sample(body, f"http_request_sql_seconds_sum{{{route}}}") > sample(before, f"http_request_sql_seconds_sum{{{route}}}")
+    assert sample(body, 'http_requests_in_flight{method="GET"}') == 1  # the /metrics request itself
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = metrics.Histogram("latency_seconds", "Latency.", ["route"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "/a")
+
+    assert histogram.render()[2:] == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 3.65',
+        'latency_seconds_count{route="/a"} 4',
+    ]
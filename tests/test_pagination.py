@@ -0,0 +1,80 @@
+from datetime import date, time
+
+import models
+import pagination
+from conftest import make_user
+
+
+def add_event(db, organizer, day, start="18:00:00", title="Event"):
+    event = models.Event(
+        title=title,
+        date=date(2030, 1, day),
+        time=time.fromisoformat(start),
+        location="Lisbon",
+        organizer_id=organizer.id,
+    )
+    db.add(event)
+    db.commit()
+    return event.id
+
+
+def walk(client, url, **params):
+    ids, cursor = [], None
+    while True:
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get(url, params=params).json()
+        ids.extend(item["id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_events_are_paged_by_date_time_and_id(client, db):
+    organizer = make_user(db, "Organizer")
+    expected = [
+        add_event(db, organizer, 1, "09:00:00"),
+        add_event(db, organizer, 1, "18:00:00"),
+        add_event(db, organizer, 1, "18:00:00"),
+        add_event(db, organizer, 2, "07:30:00"),
+        add_event(db, organizer, 3, "12:00:00"),
+    ]
+
+    assert walk(client, "/events/", limit=2) == expected
+
+
+def test_event_pages_stay_stable_when_rows_are_inserted(client, db):
+    organizer = make_user(db, "Organizer")
+    first = [add_event(db, organizer, day) for day in (1, 2)]
+    later = add_event(db, organizer, 5)
+
+    page = client.get("/events/", params={"limit": 2}).json()
+    assert [e["id"] for e in page["items"]] == first
+
+    add_event(db, organizer, 1, "08:00:00")  # sorts before the cursor
+    page = client.get("/events/", params={"limit": 2, "cursor": page["next_cursor"]}).json()
+    assert [e["id"] for e in page["items"]] == [later]
+    assert page["next_cursor"] is None
+
+
+def test_events_can_be_filtered_by_start_time(client, db):
+    organizer = make_user(db, "Organizer")
+    add_event(db, organizer, 1, "17:59:59")
+    evening = [add_event(db, organizer, day, "18:00:00") for day in (1, 2)] + [add_event(db, organizer, 3, "21:30:00")]
+
+    assert walk(client, "/events/", limit=2, starts_after="18:00") == evening
+    assert client.get("/events/", params={"starts_after": "6pm"}).status_code == 422
+
+
+def test_groups_are_paged_by_id(client, db):
+    owner = make_user(db, "Owner")
+    groups = [models.Group(name=f"Group {i}", owner_id=owner.id) for i in range(5)]
+    db.add_all(groups)
+    db.commit()
+
+    assert walk(client, "/groups/", limit=2) == [g.id for g in groups]
+
+
+def test_invalid_cursor_is_rejected(client, db):
+    assert client.get("/events/", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/groups/", params={"cursor": pagination.encode_cursor("1")}).status_code == 400
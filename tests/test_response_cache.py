@@ -0,0 +1,107 @@
+import pytest
+
+import cache
+from conftest import auth_headers, make_user
+
+
+class FakeRedis:
+    """Just enough of the redis-py client for RedisBackend."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, name):
+        return self.data.get(name)
+
+    def set(self, name, value, ex=None):
+        self.data[name] = value
+
+    def sadd(self, name, *values):
+        self.data.setdefault(name, set()).update(values)
+
+    def smembers(self, name):
+        return set(self.data.get(name, set()))
+
+    def expire(self, name, seconds):
+        pass
+
+    def delete(self, *names):
+        for name in names:
+            self.data.pop(name, None)
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "memory":
+        backend = cache.InMemoryBackend(maxsize=100, ttl=60)
+    else:
+        backend = cache.RedisBackend(FakeRedis(), ttl=60)
+    cache.response_cache.backend = backend
+    return backend
+
+
+def test_group_listing_is_served_from_cache_until_a_group_is_created(client, db, backend, count_queries):
+    headers = auth_headers(make_user(db, "Owner"))
+    client.post("/groups/", json={"name": "Climbers"}, headers=headers)
+    client.get("/groups/")
+
+    with count_queries() as statements:
+        cached = client.get("/groups/")
+    assert statements == []
+    assert [g["name"] for g in cached.json()["items"]] == ["Climbers"]
+
+    client.post("/groups/", json={"name": "Runners"}, headers=headers)
+    assert [g["name"] for g in client.get("/groups/").json()["items"]] == ["Climbers", "Runners"]
+
+
+def test_join_group_invalidates_only_that_groups_members(client, db, backend, count_queries):
+    owner, guest = make_user(db, "Owner"), make_user(db, "Guest")
+    group_id = client.post("/groups/", json={"name": "Climbers"}, headers=auth_headers(owner)).json()["id"]
+    client.get("/groups/")
+    client.get(f"/groups/{group_id}/members")
+
+    client.post(f"/groups/{group_id}/join", headers=auth_headers(guest))
+
+    with count_queries() as statements:
+        client.get("/groups/")
+    assert statements == []
+    assert len(client.get(f"/groups/{group_id}/members").json()) == 2
+
+
+def test_event_listing_is_invalidated_by_event_writes(client, db, backend):
+    headers = auth_headers(make_user(db, "Organizer"))
+    assert client.get("/events/").json()["items"] == []
+
+    payload = {"title": "Launch", "date": "2030-01-01", "time": "18:00:00", "location": "Oslo"}
+    event_id = client.post("/events/", json=payload, headers=headers).json()["id"]
+    assert [e["title"] for e in client.get("/events/").json()["items"]] == ["Launch"]
+
+    client.put(f"/events/{event_id}", json={"title": "Relaunch"}, headers=headers)
+    assert [e["title"] for e in client.get("/events/").json()["items"]] == ["Relaunch"]
+
+
+def test_cache_keys_include_query_params(client, db, backend):
+    headers = auth_headers(make_user(db, "Organizer"))
+    for city in ("Oslo", "Rome"):
+        payload = {"title": city, "date": "2030-01-01", "time": "18:00:00", "location": city}
+        client.post("/events/", json=payload, headers=headers)
+
+    assert [e["title"] for e in client.get("/events/", params={"city": "Rome"}).json()["items"]] == ["Rome"]
+    assert len(client.get("/events/").json()["items"]) == 2
+
+
+def test_etag_revalidation_returns_not_modified(client, db, backend):
+    response = client.get("/groups/")
+    etag = response.headers["etag"]
+
+    revalidated = client.get("/groups/", headers={"If-None-Match": etag})
+
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    assert revalidated.content == b""
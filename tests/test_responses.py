@@ -0,0 +1,38 @@
+import asyncio
+from datetime import date, datetime, time
+from typing import List
+
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+import schemas
+from conftest import auth_headers, make_event, make_user
+from responses import ModelResponse
+
+
+def test_model_response_matches_the_response_model_path():
+    organizer = schemas.UserOut(id=1, name="Organizer", email="organizer@example.com", created_at=datetime(2030, 1, 1))
+    events = [
+        schemas.EventResponse(id=i, title="Meetup", date=date(2030, 1, 1), time=time(18, 0), location="Oslo",
+                              organizer=organizer, created_at=datetime(2030, 1, 1), rsvp_counts={"yes": i})
+        for i in range(3)
+    ]
+    field = create_model_field("Response", List[schemas.EventResponse], mode="serialization")
+    content = asyncio.run(serialize_response(field=field, response_content=events, is_coroutine=False))
+
+    assert ModelResponse(events, List[schemas.EventResponse]).body == ORJSONResponse(content).body
+    assert ModelResponse(events[0]).body == ORJSONResponse(content[0]).body
+
+
+def test_event_routes_return_the_built_model(client, db):
+    organizer = make_user(db, "Organizer")
+    event_id = make_event(db, organizer).id
+    headers = auth_headers(organizer)
+
+    response = client.get(f"/events/{event_id}", headers=headers)
+    mine = client.get("/events/organizers/me/events", headers=headers)
+
+    assert response.headers["content-type"] == "application/json"
+    assert (response.json()["id"], response.json()["time"]) == (event_id, "18:00:00")
+    assert [item["id"] for item in mine.json()] == [event_id]
@@ -0,0 +1,82 @@
+import models
+import rsvp_counts
+from conftest import auth_headers, make_event, make_user
+
+
+def counts(db, event):
+    db.refresh(event)
+    return (event.rsvp_yes_count, event.rsvp_no_count, event.rsvp_maybe_count)
+
+
+def test_counters_follow_rsvp_writes(client, db):
+    organizer = make_user(db, "Organizer")
+    guest = make_user(db, "Guest")
+    event = make_event(db, organizer)
+
+    client.post(f"/events/{event.id}/rsvp", headers=auth_headers(guest))
+    client.post(f"/events/{event.id}/rsvp", headers=auth_headers(guest))
+    assert counts(db, event) == (1, 0, 0)
+
+    rsvp = db.query(models.RSVP).filter_by(user_id=guest.id).one()
+    rsvp.status = "maybe"
+    db.commit()
+    assert counts(db, event) == (0, 0, 1)
+
+    client.delete(f"/events/{event.id}/rsvp", headers=auth_headers(guest))
+    assert counts(db, event) == (0, 0, 0)
+
+
+def test_event_reads_use_counters_without_touching_rsvps(client, db, count_queries):
+    organizer = make_user(db, "Organizer")
+    event = make_event(db, organizer)
+    db.add_all([models.RSVP(user_id=make_user(db, f"Guest {i}").id, event_id=event.id, status=s) for i, s in enumerate(["yes", "no", "no"])])
+    db.commit()
+
+    with count_queries() as statements:
+        body = client.get("/events/").json()["items"][0]
+
+    assert (body["rsvp_count"], body["rsvp_counts"]) == (1, {"yes": 1, "no": 2, "maybe": 0})
+    assert not any("rsvps" in statement for statement in statements)
+
+
+def test_reconcile_repairs_drifted_counters(db):
+    organizer = make_user(db, "Organizer")
+    drifted, accurate = make_event(db, organizer), make_event(db, organizer)
+    db.add(models.RSVP(user_id=organizer.id, event_id=drifted.id, status="yes"))
+    db.add(models.RSVP(user_id=organizer.id, event_id=accurate.id, status="maybe"))
+    db.commit()
+    db.query(models.Event).filter(models.Event.id == drifted.id).update({"rsvp_yes_count": 7, "rsvp_no_count": 2})
+    db.commit()
+
+    assert rsvp_counts.reconcile_rsvp_counts(db) == 1
+    assert counts(db, drifted) == (1, 0, 0)
+    assert counts(db, accurate) == (0, 0, 1)
+    assert rsvp_counts.reconcile_rsvp_counts(db) == 0
+
+
+def test_rsvp_is_a_single_idempotent_upsert(client, db, count_queries):
+    organizer = make_user(db, "Organizer")
+    event = make_event(db, organizer)
+    headers = auth_headers(organizer)
+    client.get("/me", headers=headers)
+    db.add(models.RSVP(user_id=organizer.id, event_id=event.id, status="maybe"))
+    db.commit()
+    url = f"/events/{event.id}/rsvp"
+
+    with count_queries() as statements:
+        first = client.post(url, headers=headers)
+    second = client.post(url, headers=headers)
+
+    assert len(statements) == 1 and "ON CONFLICT" in statements[0]
+    assert first.json()["status"] == "yes" and first.json()["id"] == second.json()["id"]
+    assert db.query(models.RSVP).count() == 1
+    assert counts(db, event) == (1, 0, 0)
+
+
+def test_rsvp_to_missing_event_inserts_nothing(client, db):
+    organizer = make_user(db, "Organizer")
+
+    response = client.post("/events/999/rsvp", headers=auth_headers(organizer))
+
+    assert response.status_code == 404
+    assert db.query(models.RSVP).count() == 0
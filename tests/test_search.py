@@ -0,0 +1,80 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+import models
+import search
+from conftest import make_event, make_user
+
+
+def test_search_ranks_title_matches_first_and_highlights(client, db):
+    organizer = make_user(db, "Organizer")
+    in_description = make_event(db, organizer, title="Friday social", description="Live jazz and drinks on the roof").id
+    in_title = make_event(db, organizer, title="Jazz night", description="Trio from Oslo").id
+    make_event(db, organizer, title="Chess club")
+
+    body = client.get("/events/search", params={"q": "jazz"}).json()
+
+    assert [item["id"] for item in body["items"]] == [in_title, in_description]
+    assert body["items"][0]["rank"] > body["items"][1]["rank"]
+    assert "<mark>jazz</mark>" in body["items"][1]["snippet"]
+    assert body["next_offset"] is None
+
+
+def test_search_requires_every_term_and_pages_by_offset(client, db):
+    organizer = make_user(db, "Organizer")
+    matches = [make_event(db, organizer, title=f"Python meetup {i}", location="Lisbon").id for i in range(3)]
+    make_event(db, organizer, title="Python meetup", location="Porto")
+
+    first = client.get("/events/search", params={"q": "python lisbon", "limit": 2}).json()
+    second = client.get("/events/search", params={"q": "python lisbon", "limit": 2, "offset": first["next_offset"]}).json()
+
+    assert [item["id"] for item in first["items"] + second["items"]] == matches
+    assert client.get("/events/search", params={"q": ""}).status_code == 422
+
+
+def test_snippets_escape_event_markup(client, db):
+    organizer = make_user(db, "Organizer")
+    make_event(db, organizer, title="Party <img src=x onerror=alert(1)>", description="Bring <b>snacks</b> & friends")
+
+    snippet = client.get("/events/search", params={"q": "party"}).json()["items"][0]["snippet"]
+
+    assert snippet == "<mark>Party</mark> &lt;img src=x onerror=alert(1)&gt; Bring &lt;b&gt;snacks&lt;/b&gt; &amp; friends"
+
+
+def test_postgresql_headlines_are_escaped_before_marking():
+    headline = f"{search.SENTINEL_START}Party{search.SENTINEL_STOP} <img src=x onerror=alert(1)>"
+    assert search.mark_headline(headline) == "<mark>Party</mark> &lt;img src=x onerror=alert(1)&gt;"
+
+
+def test_highlight_excerpts_around_the_first_match():
+    text_ = "x" * 300 + " Jazz brunch " + "y" * 300
+    snippet = search.highlight(text_, ["jazz"])
+    assert "<mark>Jazz</mark> brunch" in snippet
+    assert len(snippet) <= search.SNIPPET_CHARS + len("<mark></mark>")
+
+
+@pytest.mark.skipif(not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL (PostgreSQL) not set")
+def test_postgresql_search_uses_the_tsvector_index():
+    engine = create_engine(os.environ["TEST_DATABASE_URL"])
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        organizer = make_user(db, "Organizer")
+        for i in range(200):
+            make_event(db, organizer, title=f"Event {i}", description="Jazz quartet" if i % 50 == 0 else "Board games")
+        hits = search.search_events(db, "jazz", 10)
+        assert len(hits) == 4 and all("<mark>" in hit.snippet for hit in hits)
+        db.execute(text("ANALYZE events"))
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join(row[0] for row in db.execute(text(
+            "EXPLAIN SELECT id FROM events WHERE search_vector @@ websearch_to_tsquery('english', 'jazz')"
+        )))
+        assert "ix_events_search_vector" in plan
+    finally:
+        db.rollback()
+        db.close()
+        models.Base.metadata.drop_all(bind=engine)
+        engine.dispose()
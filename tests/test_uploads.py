@@ -0,0 +1,260 @@
+import hashlib
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+import images
+import models
+import storage
+from conftest import auth_headers, make_event, make_user
+from routers import events
+
+
+@pytest.fixture
+def media_root(tmp_path, monkeypatch):
+    root = str(tmp_path / "uploads")
+    monkeypatch.setattr(storage, "MEDIA_ROOT", root)
+    monkeypatch.setattr(storage, "media_storage", storage.LocalStorage(root))
+    return tmp_path / "uploads"
+
+
+def stored_files(root):
+    return sorted(name for name in os.listdir(root) if name != ".staging")
+
+
+def jpeg_bytes(color):
+    from PIL import Image
+
+    source = io.BytesIO()
+    Image.new("RGB", (640, 360), color).save(source, "JPEG")
+    return source.getvalue()
+
+
+@pytest.fixture
+def organizer_event(db, media_root):
+    organizer = make_user(db, "Organizer")
+    return auth_headers(organizer), make_event(db, organizer).id
+
+
+def png_bytes():
+    from PIL import Image
+
+    source = io.BytesIO()
+    Image.effect_noise((200, 200), 64).save(source, "PNG")
+    return source.getvalue()
+
+
+def test_banner_is_stored_under_its_content_hash(client, organizer_event, media_root, monkeypatch):
+    headers, event_id = organizer_event
+    monkeypatch.setattr(storage, "UPLOAD_CHUNK_SIZE", 1024)
+    content = png_bytes()
+
+    # The extension comes from the detected format, not the client's filename
+    response = client.post(f"/events/{event_id}/upload", files={"file": ("banner.html", content, "text/html")}, headers=headers)
+
+    assert response.status_code == 200
+    digest = hashlib.sha256(content).hexdigest()
+    key = digest + ".png"
+    assert stored_files(media_root) == sorted([key] + [f"{digest}_{name}.webp" for name in images.BANNER_VARIANTS])
+    assert (media_root / key).read_bytes() == content
+    assert os.listdir(media_root / ".staging") == []
+
+
+@pytest.mark.parametrize("content", [b"<html><script>alert(1)</script></html>", b'<svg xmlns="http://www.w3.org/2000/svg"/>', b"\xff\xd8\xff" + b"x" * 100])
+def test_non_image_banners_are_rejected_without_leftovers(client, organizer_event, media_root, content):
+    headers, event_id = organizer_event
+
+    response = client.post(f"/events/{event_id}/upload", files={"file": ("banner.jpg", content, "image/jpeg")}, headers=headers)
+
+    assert response.status_code == 400
+    assert stored_files(media_root) == []
+    assert os.listdir(media_root / ".staging") == []
+
+
+def test_identical_banners_are_stored_once(client, db, organizer_event, media_root):
+    headers, event_id = organizer_event
+    other_id = make_event(db, db.get(models.Event, event_id).organizer, title="Afterparty").id
+    content = jpeg_bytes("blue")
+
+    first = client.post(f"/events/{event_id}/upload", files={"file": ("a.jpg", content, "image/jpeg")}, headers=headers)
+    second = client.post(f"/events/{other_id}/upload", files={"file": ("b.jpg", content, "image/jpeg")}, headers=headers)
+
+    assert first.json()["banner_url"] == second.json()["banner_url"]
+    assert len([name for name in stored_files(media_root) if name.endswith(".jpg")]) == 1
+
+
+def test_superseded_banner_is_collected_once_unreferenced(client, db, organizer_event, media_root):
+    headers, event_id = organizer_event
+    other_id = make_event(db, db.get(models.Event, event_id).organizer, title="Afterparty").id
+    old, new = jpeg_bytes("red"), jpeg_bytes("green")
+    old_key = hashlib.sha256(old).hexdigest()
+
+    for target in (event_id, other_id):
+        client.post(f"/events/{target}/upload", files={"file": ("old.jpg", old, "image/jpeg")}, headers=headers)
+    client.post(f"/events/{event_id}/upload", files={"file": ("new.jpg", new, "image/jpeg")}, headers=headers)
+    # Still the banner of the other event
+    assert f"{old_key}.jpg" in stored_files(media_root)
+
+    client.post(f"/events/{other_id}/upload", files={"file": ("new.jpg", new, "image/jpeg")}, headers=headers)
+    assert not [name for name in stored_files(media_root) if name.startswith(old_key)]
+    assert len(stored_files(media_root)) == 4
+
+
+def test_oversized_banner_is_rejected_without_leftovers(client, organizer_event, media_root, monkeypatch):
+    headers, event_id = organizer_event
+    monkeypatch.setattr(storage, "MAX_UPLOAD_BYTES", 4096)
+
+    response = client.post(f"/events/{event_id}/upload", files={"file": ("banner.jpg", b"x" * 5000, "image/jpeg")}, headers=headers)
+
+    assert response.status_code == 413
+    assert stored_files(media_root) == []
+    assert os.listdir(media_root / ".staging") == []
+
+
+@pytest.fixture
+def limited_client():
+    app = FastAPI()
+    app.add_middleware(storage.UploadSizeLimitMiddleware, path_pattern=r"^/upload$", max_bytes=100)
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        return {"size": len(await request.body())}
+
+    return TestClient(app)
+
+
+def test_middleware_rejects_by_content_length(limited_client):
+    assert limited_client.post("/upload", content=b"x" * 50).json() == {"size": 50}
+    assert limited_client.post("/upload", content=b"x" * 101).status_code == 413
+
+
+def test_middleware_rejects_chunked_bodies_mid_stream(limited_client):
+    def chunks():
+        for _ in range(10):
+            yield b"x" * 40
+
+    assert limited_client.post("/upload", content=chunks()).status_code == 413
+
+
+def test_banner_variants_are_rendered_in_the_background(client, db, organizer_event, media_root):
+    from PIL import Image
+
+    headers, event_id = organizer_event
+    source = io.BytesIO()
+    Image.new("RGB", (3000, 2000), "red").save(source, "JPEG")
+
+    response = client.post(f"/events/{event_id}/upload", files={"file": ("banner.jpg", source.getvalue(), "image/jpeg")}, headers=headers)
+
+    assert response.json()["banner_thumb_url"] is None
+    event = db.get(models.Event, event_id)
+    db.refresh(event)
+    expected = {"banner_thumb_url": (320, 180), "banner_card_url": (800, 450), "banner_full_url": (1620, 1080)}
+    for column, size in expected.items():
+        url = getattr(event, column)
+        assert url.startswith("/media/") and url.endswith(".webp")
+        with Image.open(media_root / url.rsplit("/", 1)[1]) as variant:
+            assert (variant.format, variant.size) == ("WEBP", size)
+
+
+def test_banner_rendering_failures_are_logged(client, db, organizer_event, media_root, monkeypatch, caplog):
+    headers, event_id = organizer_event
+
+    async def broken_render(*args):
+        raise OSError("decoder crashed")
+
+    monkeypatch.setattr(images, "render_banner_variants_async", broken_render)
+    with caplog.at_level("ERROR", logger="routers.events"):
+        response = client.post(f"/events/{event_id}/upload", files={"file": ("banner.jpg", jpeg_bytes("red"), "image/jpeg")}, headers=headers)
+
+    assert response.status_code == 200
+    record = next(r for r in caplog.records if r.name == "routers.events")
+    assert f"event {event_id}" in record.getMessage() and record.exc_info[0] is OSError
+    assert os.listdir(media_root / ".staging") == []
+
+
+def test_failed_upload_leaves_no_staged_or_stored_files(client, db, organizer_event, media_root, monkeypatch):
+    headers, event_id = organizer_event
+
+    def broken_commit():
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(db, "commit", broken_commit)
+    with pytest.raises(RuntimeError):
+        client.post(f"/events/{event_id}/upload", files={"file": ("banner.jpg", jpeg_bytes("red"), "image/jpeg")}, headers=headers)
+
+    assert os.listdir(media_root / ".staging") == []
+    assert stored_files(media_root) == []
+
+
+def test_supabase_configuration_defaults_to_s3():
+    env = {key: value for key, value in os.environ.items() if key != "STORAGE_BACKEND"}
+    env["SUPABASE_URL"] = "https://ref.storage.supabase.co/storage/v1/s3"
+    result = subprocess.run(
+        [sys.executable, "-c", "import storage; print(storage.STORAGE_BACKEND, storage.S3_ENDPOINT_URL, storage.S3_PUBLIC_URL)"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), env=env, capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.split() == [
+        "s3", "https://ref.storage.supabase.co/storage/v1/s3", "https://ref.storage.supabase.co/storage/v1/object/public/banners",
+    ]
+
+
+class FakeS3Client:
+    class exceptions:
+        from botocore.exceptions import ClientError
+
+    def __init__(self):
+        self.objects = {}
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise self.exceptions.ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {}
+
+    def upload_file(self, Filename, Bucket, Key, ExtraArgs=None):
+        with open(Filename, "rb") as f:
+            self.objects[(Bucket, Key)] = (f.read(), ExtraArgs)
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+class FakeSession:
+    def __init__(self, client):
+        self._client = client
+        self.clients_created = 0
+
+    def client(self, service, **kwargs):
+        self.clients_created += 1
+        return self._client
+
+
+def test_s3_client_is_built_on_first_use():
+    session = FakeSession(FakeS3Client())
+    backend = storage.S3Storage("banners", endpoint_url="https://s3.example.com", session=session)
+    assert session.clients_created == 0
+
+    backend.warm_up()
+    backend.exists("abc.jpg")
+    assert session.clients_created == 1
+
+
+def test_s3_storage_skips_existing_keys(tmp_path):
+    client = FakeS3Client()
+    backend = storage.S3Storage("banners", endpoint_url="https://s3.example.com", session=FakeSession(client))
+    source = tmp_path / "banner.jpg"
+    source.write_bytes(b"banner")
+
+    url = backend.put(str(source), "abc.jpg", "image/jpeg")
+    source.write_bytes(b"changed")
+    backend.put(str(source), "abc.jpg", "image/jpeg")
+
+    assert url == "https://s3.example.com/banners/abc.jpg"
+    assert backend.key_for(url) == "abc.jpg" and backend.exists("abc.jpg")
+    assert client.objects[("banners", "abc.jpg")] == (b"banner", {"ContentType": "image/jpeg"})
+    backend.delete("abc.jpg")
+    assert not backend.exists("abc.jpg")